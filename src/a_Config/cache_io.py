@@ -0,0 +1,110 @@
+"""
+File helpers shared by the on-disk caches: content digests of input files and of
+the code that processes them, and atomic writes of cache entries.
+
+This module has no dependencies inside the repo so that any layer, including
+a_Config.config_registry, can use it.
+"""
+import ast
+import functools
+import hashlib
+import os
+import threading
+from typing import Callable
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Content digests keyed on path, reused while the file's (mtime_ns, size) is unchanged
+_FILE_DIGESTS: dict[str, tuple[tuple[int, int], bytes]] = {}
+
+
+def file_digest(path: str) -> bytes:
+    """
+    Returns the SHA-256 digest of a file's contents. The file is only re-read when
+    its modification time or size has changed since it was last hashed.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_DIGESTS.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _FILE_DIGESTS[path] = (signature, digest.digest())
+    return digest.digest()
+
+
+def hash_files(paths: list[str]) -> str:
+    """
+    Returns a SHA-256 fingerprint over the names and contents of paths, in order.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_digest(path))
+    return digest.hexdigest()
+
+
+def _local_module_path(module_name: str) -> str | None:
+    base = os.path.join(SRC_DIR, *module_name.split('.'))
+    for path in (f"{base}.py", os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _imported_module_names(path: str) -> set[str]:
+    # Every import in the file, including function-level ones, plus its parent packages
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names if alias.name != '*')
+    return {'.'.join(parts[:i]) for parts in (n.split('.') for n in names) for i in range(1, len(parts) + 1)}
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint(module_name: str) -> str:
+    """
+    Returns a SHA-256 fingerprint over the source of module_name and of every module
+    under src it imports, transitively. Keying a cache on it invalidates entries
+    whenever the code that produced them changes, with no version to bump by hand.
+
+    Computed once per process, so it describes the code that is actually loaded.
+    """
+    paths = {}
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        if name in paths:
+            continue
+        paths[name] = _local_module_path(name)
+        if paths[name] is not None:
+            pending.extend(_imported_module_names(paths[name]))
+
+    digest = hashlib.sha256()
+    for path in sorted(p for p in paths.values() if p is not None):
+        digest.update(os.path.relpath(path, SRC_DIR).encode())
+        digest.update(file_digest(path))
+    return digest.hexdigest()
+
+
+def atomic_write(path: str, write: Callable[[str], None]) -> None:
+    """
+    Calls write with a temporary path next to path, then renames it into place so a
+    concurrent reader never sees a partial file. Creates the parent directory.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
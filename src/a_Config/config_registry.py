@@ -0,0 +1,119 @@
+import glob
+import os
+import pickle
+import pandas as pd
+from typing import Any, Callable, Dict, Optional
+from a_Config.cache_io import atomic_write, file_digest
+
+CSV_CONFIGS_DIR = os.path.join(os.path.dirname(__file__), 'csv_configs')
+CONFIG_REGISTRY_ARTIFACT = os.path.join(os.path.dirname(__file__), '__pycache__', 'config_registry.pkl')
+
+# Bump when the shape of any registered config changes so stale artifacts are ignored.
+_ARTIFACT_FORMAT_VERSION = 2
+
+_BUILDERS: Dict[str, Callable[[], Any]] = {}
+_VALUES: Dict[str, Any] = {}
+_artifact_checked = False
+
+
+def register_config(name: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Register a zero-argument builder for the config named ``name``.
+
+    The builder runs at most once per process, on the first ``get_config(name)``
+    that is not already satisfied by a valid compiled artifact.
+    """
+    def decorator(builder: Callable[[], Any]) -> Callable[[], Any]:
+        _BUILDERS[name] = builder
+        return builder
+    return decorator
+
+
+def get_config(name: str) -> Any:
+    """Return the memoized config ``name``, loading or building it on first access.
+
+    Raises:
+        KeyError: If no builder is registered under ``name``.
+    """
+    if name not in _VALUES:
+        _load_artifact_once()
+    if name not in _VALUES:
+        _VALUES[name] = _BUILDERS[name]()
+    return _VALUES[name]
+
+
+def read_config_csv(file_name: str, **kwargs) -> pd.DataFrame:
+    """Read one of the csv_configs tables."""
+    return pd.read_csv(os.path.join(CSV_CONFIGS_DIR, file_name), **kwargs)
+
+
+def get_config_hashes() -> Dict[str, str]:
+    """Return the sha256 of every CSV in csv_configs, keyed by file name."""
+    return {
+        os.path.basename(path): file_digest(path).hex()
+        for path in sorted(glob.glob(os.path.join(CSV_CONFIGS_DIR, '*.csv')))
+    }
+
+
+def _artifact_header() -> Dict[str, Any]:
+    return {
+        'format_version': _ARTIFACT_FORMAT_VERSION,
+        'pandas_version': pd.__version__,
+        'config_hashes': get_config_hashes(),
+    }
+
+
+def _load_artifact_once(path: str = CONFIG_REGISTRY_ARTIFACT) -> None:
+    """Populate the registry from the compiled artifact if it matches the current CSVs."""
+    global _artifact_checked
+    if _artifact_checked:
+        return
+    _artifact_checked = True
+
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != _artifact_header():
+                return
+            values = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return
+    for name, value in values.items():
+        _VALUES.setdefault(name, value)
+
+
+def _import_config_modules() -> None:
+    # Builders register themselves on import.
+    import a_Config.coordinate_codes  # noqa: F401
+    import a_Config.fin_statement_model_utils  # noqa: F401
+    import a_Config.global_constants  # noqa: F401
+
+
+def compile_config_registry(path: Optional[str] = CONFIG_REGISTRY_ARTIFACT) -> Dict[str, Any]:
+    """Build every registered config and write them to a single artifact.
+
+    The artifact is only reused while the CSVs in csv_configs hash to the values
+    recorded in it; editing any config silently falls back to the CSVs.
+
+    Args:
+        path: Destination of the artifact. If None, nothing is written.
+
+    Returns:
+        Dict of config name to compiled value.
+    """
+    _import_config_modules()
+    values = {name: get_config(name) for name in _BUILDERS}
+    if path is not None:
+        def write(tmp_path: str) -> None:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(_artifact_header(), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(path, write)
+    return values
+
+
+if __name__ == '__main__':
+    # Go through the package module so builders register into the same registry.
+    from a_Config import config_registry
+    compiled = config_registry.compile_config_registry()
+    print(f"Compiled {len(compiled)} configs to {CONFIG_REGISTRY_ARTIFACT}")
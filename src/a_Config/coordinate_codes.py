@@ -0,0 +1,70 @@
+import numpy as np
+import xarray as xr
+from typing import Dict, Iterable, NamedTuple
+
+import a_Config.fin_statement_model_utils  # noqa: F401  (registers VALID_MEASURES)
+from a_Config.config_registry import get_config, register_config
+from a_Config.enumerations.state_enum import State
+
+# Cube dimensions that carry integer codes instead of labels.
+CODED_DIMS = ('organization', 'state', 'measure')
+
+
+class CoordinateCodes(NamedTuple):
+    """Stable integer codes for the labelled dimensions of the core cube.
+
+    Codes are assigned in sorted label order, so sorting a coded axis gives the
+    same order as sorting its labels, and they only change when the configs do.
+    """
+    labels: Dict[str, np.ndarray]
+    codes: Dict[str, Dict[str, int]]
+
+
+@register_config('COORDINATE_CODES')
+def _build_coordinate_codes() -> CoordinateCodes:
+    from a_Config.enumerations.hospital_enum import HealthSystem, Hospital, to_entity
+
+    names = {
+        'organization': sorted({str(e) for e in Hospital} | {str(e) for e in HealthSystem}),
+        'state': sorted(str(s) for s in State),
+        'measure': sorted(get_config('VALID_MEASURES')),
+    }
+    to_label = {'organization': to_entity, 'state': State, 'measure': str}
+    labels = {
+        dim: np.array([to_label[dim](name) for name in dim_names], dtype=object)
+        for dim, dim_names in names.items()
+    }
+    codes = {dim: {name: code for code, name in enumerate(dim_names)} for dim, dim_names in names.items()}
+    return CoordinateCodes(labels=labels, codes=codes)
+
+
+def get_coordinate_codes() -> CoordinateCodes:
+    """Return the memoized coordinate code registry."""
+    return get_config('COORDINATE_CODES')
+
+
+def encode_labels(dim: str, labels: Iterable) -> np.ndarray:
+    """Map labels of a coded dimension to their integer codes.
+
+    Raises:
+        ValueError: If a label has no code for ``dim``.
+    """
+    codes = get_coordinate_codes().codes[dim]
+    labels = list(labels)
+    try:
+        return np.fromiter((codes[label] for label in labels), dtype=np.int32, count=len(labels))
+    except KeyError as e:
+        raise ValueError(f"'{e.args[0]}' is not a known {dim}.") from None
+
+
+def decode_codes(dim: str, codes: np.ndarray) -> np.ndarray:
+    """Map integer codes of a coded dimension back to their labels (an array lookup)."""
+    return get_coordinate_codes().labels[dim][np.asarray(codes, dtype=np.intp)]
+
+
+def decode_dataset(ds: xr.Dataset) -> xr.Dataset:
+    """Swap the integer codes on any coded coordinate of ds (dimension or not) back to labels."""
+    return ds.assign_coords({
+        dim: (ds.coords[dim].dims, decode_codes(dim, ds.coords[dim].values))
+        for dim in CODED_DIMS if dim in ds.coords
+    })
@@ -1,5 +1,24 @@
 from .change_type_enum import ChangeType
-from .hospital_enum import Entity, HealthSystem, Hospital, to_entity
+from .hospital_enum import to_entity
 from .measure_source_enum import MeasureSource
 from .moving_avg_or_endpoint_enum import MovingAvgOrEndpoint
-from .state_enum import State
\ No newline at end of file
+from .state_enum import State
+
+__all__ = [
+    'ChangeType',
+    'Entity',
+    'HealthSystem',
+    'Hospital',
+    'MeasureSource',
+    'MovingAvgOrEndpoint',
+    'State',
+    'to_entity',
+]
+
+
+def __getattr__(name: str):
+    # Hospital/HealthSystem are built from hospital_metadata.csv, so defer them until first use.
+    if name in ('Entity', 'HealthSystem', 'Hospital'):
+        from . import hospital_enum
+        return getattr(hospital_enum, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,6 +2,7 @@ import re
 import os
 import pandas as pd
 from enum import StrEnum
+from functools import lru_cache
 
 
 def _to_key(name: str) -> str:
@@ -11,21 +12,36 @@ def _to_key(name: str) -> str:
 
 
 _CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'csv_configs', 'hospital_metadata.csv')
-_df = pd.read_csv(_CSV_PATH)
 
-Hospital = StrEnum('Hospital', {_to_key(name): name for name in _df['Organization']})
-HealthSystem = StrEnum('HealthSystem', {_to_key(name): name for name in _df['Healthcare System'].unique()})
 
-Entity = Hospital | HealthSystem
+@lru_cache(maxsize=None)
+def _build_entity_enums() -> tuple[type[StrEnum], type[StrEnum]]:
+    """Build the Hospital and HealthSystem enums from hospital_metadata.csv on first use."""
+    df = pd.read_csv(_CSV_PATH)
+    hospital = StrEnum('Hospital', {_to_key(name): name for name in df['Organization']}, module=__name__)
+    health_system = StrEnum(
+        'HealthSystem', {_to_key(name): name for name in df['Healthcare System'].unique()}, module=__name__
+    )
+    # Bind at module level so later lookups (and pickle) skip __getattr__.
+    globals().update(Hospital=hospital, HealthSystem=health_system, Entity=hospital | health_system)
+    return hospital, health_system
 
 
-def to_entity(name: str) -> Hospital | HealthSystem:
+def __getattr__(name: str):
+    if name in ('Hospital', 'HealthSystem', 'Entity'):
+        _build_entity_enums()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def to_entity(name: str) -> 'Hospital | HealthSystem':
+    hospital, health_system = _build_entity_enums()
     try:
-        return Hospital(name)
+        return hospital(name)
     except ValueError:
         pass
     try:
-        return HealthSystem(name)
+        return health_system(name)
     except ValueError:
         pass
     raise ValueError(f"'{name}' is not a known Hospital or HealthSystem.")
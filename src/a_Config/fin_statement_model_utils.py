@@ -1,107 +1,266 @@
-import os
+import numpy as np
 import pandas as pd
 from functools import lru_cache
-from typing import Dict, List, Set
+from typing import Dict, List, NamedTuple, Set
 
-_MAPPINGS_DIR = os.path.join(os.path.dirname(__file__), 'csv_configs')
+from a_Config.config_registry import get_config, read_config_csv, register_config
+
+# Module attributes below are built on first access (see __getattr__) rather than at import.
+_LAZY_CONFIGS = (
+    'FINANCIAL_STATEMENT_MODEL',
+    'FIN_STATEMENT_TREE',
+    'CHILDREN_SUM_OPERATOR',
+    'VALID_MEASURES',
+    'ALL_RATIOS',
+    'LINE_ITEMS',
+    'BALANCE_SHEET_MEASURES',
+    'INCOME_STATEMENT_MEASURES',
+    'OTHER_MEASURES',
+)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CONFIGS:
+        return get_config(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FinStatementTree(NamedTuple):
+    """Compiled index over the Parent column of fin_statement_model.csv.
+
+    Nodes are numbered by their row in the model. ``preorder`` lists nodes in
+    depth-first order (siblings in model order), so the subtree of node ``i``
+    is ``preorder[preorder_pos[i]:subtree_end[i]]``.
+    """
+    measures: tuple[str, ...]
+    position: Dict[str, int]
+    parent: np.ndarray
+    children: tuple[tuple[int, ...], ...]
+    depth: np.ndarray
+    preorder: np.ndarray
+    preorder_pos: np.ndarray
+    subtree_end: np.ndarray
+    ancestors: tuple[tuple[str, ...], ...]
+    paths: tuple[str, ...]
+
+
+def _compile_fin_statement_tree(model: pd.DataFrame) -> FinStatementTree:
+    measures = tuple(str(m).strip() for m in model.index)
+    position = {m: i for i, m in enumerate(measures)}
+    n = len(measures)
+
+    parent = np.full(n, -1, dtype=np.int64)
+    children: List[List[int]] = [[] for _ in range(n)]
+    for i, p in enumerate(model['Parent']):
+        if pd.isna(p) or str(p).strip() in ('', measures[i]):
+            continue
+        if str(p).strip() not in position:
+            raise ValueError(f"Parent '{p}' of measure '{measures[i]}' is not in the financial statement model.")
+        parent[i] = position[str(p).strip()]
+        children[parent[i]].append(i)
+
+    depth = np.zeros(n, dtype=np.int64)
+    preorder = np.empty(n, dtype=np.int64)
+    preorder_pos = np.full(n, -1, dtype=np.int64)
+    subtree_end = np.empty(n, dtype=np.int64)
+    ancestors: List[tuple[str, ...]] = [()] * n
+    order = 0
+    for root in np.flatnonzero(parent == -1):
+        stack = [(int(root), False)]
+        while stack:
+            node, finished = stack.pop()
+            if finished:
+                subtree_end[node] = order
+                continue
+            preorder[order] = node
+            preorder_pos[node] = order
+            order += 1
+            stack.append((node, True))
+            for child in reversed(children[node]):
+                depth[child] = depth[node] + 1
+                ancestors[child] = ancestors[node] + (measures[node],)
+                stack.append((child, False))
+    if order != n:
+        cyclic = [measures[i] for i in np.flatnonzero(preorder_pos == -1)]
+        raise ValueError(f"Financial statement model has a cycle through: {cyclic}")
+
+    return FinStatementTree(
+        measures=measures,
+        position=position,
+        parent=parent,
+        children=tuple(tuple(c) for c in children),
+        depth=depth,
+        preorder=preorder,
+        preorder_pos=preorder_pos,
+        subtree_end=subtree_end,
+        ancestors=tuple(ancestors),
+        paths=tuple(';'.join(a + (m,)) for a, m in zip(ancestors, measures)),
+    )
+
+
+@register_config('FINANCIAL_STATEMENT_MODEL')
+def _build_financial_statement_model() -> pd.DataFrame:
+    model = read_config_csv('fin_statement_model.csv').set_index('Measure')
+    model['Negate?'] = model['Negate?'].astype(bool)
+    model['Neg_Multiplier'] = model['Negate?'].astype(int).replace({1: -1, 0: 1})
+    model['Path'] = list(_compile_fin_statement_tree(model).paths)
+    return model
+
+
+@register_config('FIN_STATEMENT_TREE')
+def _build_fin_statement_tree() -> FinStatementTree:
+    return _compile_fin_statement_tree(get_config('FINANCIAL_STATEMENT_MODEL'))
+
+
+def get_fin_statement_tree() -> FinStatementTree:
+    """Return the compiled tree index of the financial statement model."""
+    return get_config('FIN_STATEMENT_TREE')
+
+
+class ChildrenSumOperator(NamedTuple):
+    """(parent x child) aggregation matrices over the measures of the model, in model order.
+
+    ``signed[p, c]`` is the child's Neg_Multiplier when ``c`` is a direct child of ``p``
+    and 0 otherwise; ``membership`` is the same pattern with ones. ``expected_children[p]``
+    is the number of model children of ``p``.
+    """
+    signed: np.ndarray
+    membership: np.ndarray
+    expected_children: np.ndarray
+
+
+@register_config('CHILDREN_SUM_OPERATOR')
+def _build_children_sum_operator() -> ChildrenSumOperator:
+    tree = get_fin_statement_tree()
+    neg_multiplier = get_config('FINANCIAL_STATEMENT_MODEL')['Neg_Multiplier'].to_numpy(dtype=float)
+    children = np.flatnonzero(tree.parent >= 0)
+    membership = np.zeros((len(tree.measures), len(tree.measures)))
+    membership[tree.parent[children], children] = 1.0
+    return ChildrenSumOperator(
+        signed=membership * neg_multiplier[None, :],
+        membership=membership,
+        expected_children=membership.sum(axis=1),
+    )
 
-FINANCIAL_STATEMENT_MODEL: pd.DataFrame = pd.read_csv(
-    os.path.join(_MAPPINGS_DIR, 'fin_statement_model.csv')
-).set_index('Measure')
 
-FINANCIAL_STATEMENT_MODEL['Negate?'] = FINANCIAL_STATEMENT_MODEL['Negate?'].astype(bool)
-FINANCIAL_STATEMENT_MODEL['Neg_Multiplier'] = FINANCIAL_STATEMENT_MODEL['Negate?'].astype(int).replace({1: -1, 0: 1})
+def get_children_sum_operator() -> ChildrenSumOperator:
+    """Return the compiled parent/child aggregation matrices of the financial statement model."""
+    return get_config('CHILDREN_SUM_OPERATOR')
 
 
 @lru_cache(maxsize=None)
 def get_measure_paths() -> Dict[str, str]:
     """Lazy-computed hierarchical paths for all measures."""
-    model = FINANCIAL_STATEMENT_MODEL
-    paths: Dict[str, str] = {}
-    def recurse(m: str) -> str:
-        if m in paths:
-            return paths[m]
-        parent = model.loc[m, 'Parent']
-        if pd.isna(parent) or str(parent).strip() == '':
-            paths[m] = m
-            return m
-        parent_path = recurse(str(parent))
-        paths[m] = f"{parent_path};{m}"
-        return paths[m]
-    for measure in model.index:
-        recurse(str(measure))
-    return paths
+    tree = get_fin_statement_tree()
+    return dict(zip(tree.measures, tree.paths))
 
 
 def get_fin_statement_path(measure: str) -> str:
     """Get hierarchical path for a measure."""
-    return get_measure_paths()[measure]
+    tree = get_fin_statement_tree()
+    return tree.paths[tree.position[measure]]
 
 
-FINANCIAL_STATEMENT_MODEL['Path'] = FINANCIAL_STATEMENT_MODEL.index.map(get_fin_statement_path)
+def _in_model_order(measures: Set[str]) -> List[str]:
+    tree = get_fin_statement_tree()
+    return [tree.measures[i] for i in sorted(tree.position[m] for m in measures if m in tree.position)]
 
 
-def _in_model_order(measures: Set[str]) -> List[str]:
-    return [m for m in FINANCIAL_STATEMENT_MODEL.index if m in measures]
+def _subtree_positions(measure: str, include_self: bool) -> np.ndarray:
+    tree = get_fin_statement_tree()
+    node = tree.position.get(measure)
+    if node is None:
+        return np.empty(0, dtype=np.int64)
+    start = tree.preorder_pos[node] + (0 if include_self else 1)
+    return np.sort(tree.preorder[start:tree.subtree_end[node]])
 
 
 def get_fin_statement_descendants(measure: str) -> List[str]:
     """Get all descendant measures of a given measure, in model order."""
-    model = FINANCIAL_STATEMENT_MODEL
-    descendants: Set[str] = set()
-    def recurse(m):
-        children_df = model.reset_index()
-        children = children_df[children_df['Parent'] == m]['Measure'].str.strip().tolist()
-        children = [c for c in children if c != m]
-        descendants.update(children)
-        for child in children:
-            recurse(child)
-    recurse(measure)
-    return _in_model_order(descendants)
+    measures = get_fin_statement_tree().measures
+    return [measures[i] for i in _subtree_positions(measure, include_self=False)]
 
 
 def get_fin_statement_descendants_and_self(measure: str) -> List[str]:
     """Return descendants of a measure and the measure itself, in model order."""
-    return _in_model_order(set(get_fin_statement_descendants(measure)) | {measure})
+    measures = get_fin_statement_tree().measures
+    return [measures[i] for i in _subtree_positions(measure, include_self=True)]
+
+
+def get_fin_statement_children(measure: str) -> List[str]:
+    """Return the direct children of a measure, in model order."""
+    tree = get_fin_statement_tree()
+    return [tree.measures[i] for i in tree.children[tree.position[measure]]]
+
+
+def get_fin_statement_ancestors(measure: str) -> List[str]:
+    """Return the ancestors of a measure from the root down to its parent."""
+    tree = get_fin_statement_tree()
+    return list(tree.ancestors[tree.position[measure]])
+
+
+def get_fin_statement_depth(measure: str) -> int:
+    """Return the depth of a measure, with roots at depth 0."""
+    tree = get_fin_statement_tree()
+    return int(tree.depth[tree.position[measure]])
+
+
+def is_in_fin_statement_subtree(measure: str, root: str) -> bool:
+    """Return True if ``measure`` is ``root`` or one of its descendants."""
+    tree = get_fin_statement_tree()
+    node, root_node = tree.position.get(measure), tree.position.get(root)
+    if node is None or root_node is None:
+        return False
+    return bool(tree.preorder_pos[root_node] <= tree.preorder_pos[node] < tree.subtree_end[root_node])
 
 
-@lru_cache(maxsize=None)
 def get_fin_statement_path2(measure: str) -> str:
-    """Alternative hierarchical path impl (memoized, cycle-safe)."""
-    model = FINANCIAL_STATEMENT_MODEL
-    path_cache = {}
-    def recurse(m):
-        if m in path_cache:
-            return path_cache[m]
-        parent_row = model.reset_index()
-        parent_idx = parent_row[parent_row['Measure'] == m]
-        parent = parent_idx['Parent'].iloc[0] if not parent_idx.empty else ''
-        if pd.isna(parent) or parent == '' or parent == m:
-            path = m
-        else:
-            path = recurse(parent) + ';' + m
-        path_cache[m] = path
-        return path
-    return recurse(measure)
+    """Alternative hierarchical path impl, kept for callers of the old name."""
+    tree = get_fin_statement_tree()
+    return tree.paths[tree.position[measure]] if measure in tree.position else measure
 
 
 @lru_cache(maxsize=None)
 def get_enriched_financial_model() -> pd.DataFrame:
-    model = FINANCIAL_STATEMENT_MODEL.copy()
-    model['Path'] = model.index.map(get_measure_paths)
+    model = get_config('FINANCIAL_STATEMENT_MODEL').copy()
+    model['Path'] = model.index.map(get_measure_paths())
     return model
 
 
-VALID_MEASURES: List[str] = list(FINANCIAL_STATEMENT_MODEL.index.str.strip())
-ALL_RATIOS: List[str] = get_fin_statement_descendants_and_self('Ratios')
-LINE_ITEMS: List[str] = _in_model_order(set(VALID_MEASURES) - set(ALL_RATIOS))
-BALANCE_SHEET_MEASURES: List[str] = _in_model_order(
-    set(get_fin_statement_descendants_and_self('Total Unrestricted Assets'))
-    | set(get_fin_statement_descendants_and_self('Total Liabilities and Equity'))
-)
-INCOME_STATEMENT_MEASURES: List[str] = _in_model_order(
-    get_fin_statement_descendants_and_self('Net Income') + ['Total Revenue', 'Total Expenses']
-)
-OTHER_MEASURES: List[str] = _in_model_order(
-    set(LINE_ITEMS) - set(BALANCE_SHEET_MEASURES) - set(INCOME_STATEMENT_MEASURES)
-)
\ No newline at end of file
+@register_config('VALID_MEASURES')
+def _build_valid_measures() -> List[str]:
+    return list(get_config('FINANCIAL_STATEMENT_MODEL').index.str.strip())
+
+
+@register_config('ALL_RATIOS')
+def _build_all_ratios() -> List[str]:
+    return get_fin_statement_descendants_and_self('Ratios')
+
+
+@register_config('LINE_ITEMS')
+def _build_line_items() -> List[str]:
+    return _in_model_order(set(get_config('VALID_MEASURES')) - set(get_config('ALL_RATIOS')))
+
+
+@register_config('BALANCE_SHEET_MEASURES')
+def _build_balance_sheet_measures() -> List[str]:
+    return _in_model_order(
+        set(get_fin_statement_descendants_and_self('Total Unrestricted Assets'))
+        | set(get_fin_statement_descendants_and_self('Total Liabilities and Equity'))
+    )
+
+
+@register_config('INCOME_STATEMENT_MEASURES')
+def _build_income_statement_measures() -> List[str]:
+    return _in_model_order(
+        get_fin_statement_descendants_and_self('Net Income') + ['Total Revenue', 'Total Expenses']
+    )
+
+
+@register_config('OTHER_MEASURES')
+def _build_other_measures() -> List[str]:
+    return _in_model_order(
+        set(get_config('LINE_ITEMS'))
+        - set(get_config('BALANCE_SHEET_MEASURES'))
+        - set(get_config('INCOME_STATEMENT_MEASURES'))
+    )
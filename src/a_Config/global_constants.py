@@ -1,82 +1,168 @@
-import os
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, NamedTuple
 
+import a_Config.fin_statement_model_utils  # noqa: F401  (registers the fin statement model configs)
+from a_Config.config_registry import CSV_CONFIGS_DIR, get_config, read_config_csv, register_config
 from a_Config.enumerations.state_enum import State
-from a_Config.enumerations.hospital_enum import Hospital, HealthSystem
-from a_Config.fin_statement_model_utils import (
-    FINANCIAL_STATEMENT_MODEL,
-    VALID_MEASURES,
-    LINE_ITEMS,
-    ALL_RATIOS,
-    BALANCE_SHEET_MEASURES,
-    INCOME_STATEMENT_MEASURES,
-    OTHER_MEASURES
+
+if TYPE_CHECKING:
+    from a_Config.enumerations.hospital_enum import Hospital, HealthSystem
+
+# Module attributes below are built on first access (see __getattr__) rather than at import.
+# The financial statement model and its measure lists are re-exported from fin_statement_model_utils.
+_LAZY_CONFIGS = (
+    'FINANCIAL_STATEMENT_MODEL',
+    'VALID_MEASURES',
+    'LINE_ITEMS',
+    'ALL_RATIOS',
+    'BALANCE_SHEET_MEASURES',
+    'INCOME_STATEMENT_MEASURES',
+    'OTHER_MEASURES',
+    'ORG_MAPPINGS_ME',
+    'MEASURE_MAPPINGS',
+    'MEASURE_HIERARCHY_RENAMES',
+    'HOSPITAL_RENAMES_MA',
+    'EXTERNAL_MAPPINGS',
+    'EXTERNAL_MAPPING_INCIDENCE',
+    'DERIVE_RATIOS',
+    'DERIVE_RATIOS_OPERATOR',
+    'HOSPITAL_METADATA',
+    'SYSTEMS_TO_HOSPITALS_MAP',
 )
 
+
+def __getattr__(name: str):
+    if name in _LAZY_CONFIGS:
+        return get_config(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 #######################################################################################################
 # Fin Statement Metadata
 #######################################################################################################
 
-MAPPINGS_DIR = os.path.join(os.path.dirname(__file__), 'csv_configs')
-
-ORG_MAPPINGS_ME: Dict[str, str] = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'hospital_renames_me.csv')
-).set_index('As Reported')['Standardized'].to_dict()
-
-MEASURE_MAPPINGS: Dict[State, Dict[str, str]] = {
-    State(state): mapping
-    for state, mapping in (
-        pd.read_csv(os.path.join(MAPPINGS_DIR, 'clean_measure_names.csv'))
-        .groupby('State')
-        .apply(lambda g: g.set_index('As Reported')['Standardized'].to_dict())
-        .to_dict()
-    ).items()
-}
-
-MEASURE_HIERARCHY_RENAMES: Dict[tuple[str, str], str] = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'reported_measure_hierarchy_renames.csv')
-).set_index(['Measure Name', 'Parent'])['New Name'].to_dict()
-
-HOSPITAL_RENAMES_MA: Dict[tuple[str, int], str] = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'hospital_renames_ma.csv')
-).set_index(['Organization', 'Org ID'])['New Organization'].to_dict()
-
-EXTERNAL_MAPPINGS: pd.DataFrame = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'external_mappings.csv'),
-    converters={'State': State},
-)
-
-DERIVE_RATIOS: pd.DataFrame = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'derive_ratios.csv')
-)
-DERIVE_RATIOS['Multiplier'] = DERIVE_RATIOS['Multiplier'].fillna(1.0).astype(float)
-DERIVE_RATIOS['Optional?'] = DERIVE_RATIOS['Optional?'].fillna(False).astype(bool)
+MAPPINGS_DIR = CSV_CONFIGS_DIR
+
+@register_config('ORG_MAPPINGS_ME')
+def _build_org_mappings_me() -> Dict[str, str]:
+    return read_config_csv('hospital_renames_me.csv').set_index('As Reported')['Standardized'].to_dict()
+
+@register_config('MEASURE_MAPPINGS')
+def _build_measure_mappings() -> Dict[State, Dict[str, str]]:
+    return {
+        State(state): mapping
+        for state, mapping in (
+            read_config_csv('clean_measure_names.csv')
+            .groupby('State')
+            .apply(lambda g: g.set_index('As Reported')['Standardized'].to_dict())
+            .to_dict()
+        ).items()
+    }
+
+@register_config('MEASURE_HIERARCHY_RENAMES')
+def _build_measure_hierarchy_renames() -> Dict[tuple[str, str], str]:
+    return read_config_csv(
+        'reported_measure_hierarchy_renames.csv'
+    ).set_index(['Measure Name', 'Parent'])['New Name'].to_dict()
+
+@register_config('HOSPITAL_RENAMES_MA')
+def _build_hospital_renames_ma() -> Dict[tuple[str, int], str]:
+    return read_config_csv(
+        'hospital_renames_ma.csv'
+    ).set_index(['Organization', 'Org ID'])['New Organization'].to_dict()
+
+@register_config('EXTERNAL_MAPPINGS')
+def _build_external_mappings() -> pd.DataFrame:
+    return read_config_csv('external_mappings.csv', converters={'State': State})
+
+class ExternalMappingIncidence(NamedTuple):
+    """One state's external_mappings.csv rules as an (external x standardized) 0/1 matrix."""
+    external_measures: tuple[str, ...]
+    standardized_measures: tuple[str, ...]
+    incidence: np.ndarray
+
+@register_config('EXTERNAL_MAPPING_INCIDENCE')
+def _build_external_mapping_incidence() -> Dict[State, ExternalMappingIncidence]:
+    incidences = {}
+    for state, state_mappings in get_config('EXTERNAL_MAPPINGS').groupby('State', sort=False):
+        ext_to_std = state_mappings.set_index('External Measure')['Standardized Measure'].to_dict()
+        external_measures = tuple(ext_to_std)
+        standardized_measures = tuple(sorted(set(ext_to_std.values())))
+        incidence = np.zeros((len(external_measures), len(standardized_measures)))
+        incidence[
+            np.arange(len(external_measures)),
+            [standardized_measures.index(std) for std in ext_to_std.values()],
+        ] = 1.0
+        incidences[state] = ExternalMappingIncidence(external_measures, standardized_measures, incidence)
+    return incidences
+
+@register_config('DERIVE_RATIOS')
+def _build_derive_ratios() -> pd.DataFrame:
+    derive_ratios = read_config_csv('derive_ratios.csv')
+    derive_ratios['Multiplier'] = derive_ratios['Multiplier'].fillna(1.0).astype(float)
+    derive_ratios['Optional?'] = derive_ratios['Optional?'].fillna(False).astype(bool)
+    return derive_ratios
+
+class DeriveRatiosOperator(NamedTuple):
+    """derive_ratios.csv as (ratio x sub-measure) coefficient matrices.
+
+    ``numerator`` and ``denominator`` hold each term's Multiplier (summed if a sub-measure
+    repeats). ``required`` marks non-optional terms on either side: a ratio is only derivable
+    when all of its required sub-measures are present, and is NaN wherever one of them is.
+    Optional terms are zero-filled. Ratios are in sorted name order.
+    """
+    ratios: tuple[str, ...]
+    sub_measures: tuple[str, ...]
+    numerator: np.ndarray
+    denominator: np.ndarray
+    required: np.ndarray
+
+@register_config('DERIVE_RATIOS_OPERATOR')
+def _build_derive_ratios_operator() -> DeriveRatiosOperator:
+    derive_ratios = get_config('DERIVE_RATIOS')
+    ratios = tuple(sorted(derive_ratios['Measure'].unique()))
+    sub_measures = tuple(derive_ratios['Sub-Measure'].unique())
+    rows = derive_ratios['Measure'].map({r: i for i, r in enumerate(ratios)}).to_numpy()
+    cols = derive_ratios['Sub-Measure'].map({m: i for i, m in enumerate(sub_measures)}).to_numpy()
+    is_numerator = (derive_ratios['Numerator or Denominator'] == 'Numerator').to_numpy()
+    multiplier = derive_ratios['Multiplier'].to_numpy()
+    optional = derive_ratios['Optional?'].to_numpy()
+
+    numerator = np.zeros((len(ratios), len(sub_measures)))
+    denominator = np.zeros((len(ratios), len(sub_measures)))
+    np.add.at(numerator, (rows[is_numerator], cols[is_numerator]), multiplier[is_numerator])
+    np.add.at(denominator, (rows[~is_numerator], cols[~is_numerator]), multiplier[~is_numerator])
+    required = np.zeros((len(ratios), len(sub_measures)), dtype=bool)
+    required[rows[~optional], cols[~optional]] = True
+    return DeriveRatiosOperator(ratios, sub_measures, numerator, denominator, required)
 
 #######################################################################################################
 # Entity Metadata
 #######################################################################################################
 
-_hospital_metadata_raw: pd.DataFrame = pd.read_csv(
-    os.path.join(MAPPINGS_DIR, 'hospital_metadata.csv')
-).set_index(['Organization', 'State'])
-_hospital_metadata_raw.index = _hospital_metadata_raw.index.set_levels(
-    _hospital_metadata_raw.index.levels[0].map(Hospital), level=0
-).set_levels(
-    _hospital_metadata_raw.index.levels[1].map(State), level=1
-)
-HOSPITAL_METADATA: pd.DataFrame = _hospital_metadata_raw
+@register_config('HOSPITAL_METADATA')
+def _build_hospital_metadata() -> pd.DataFrame:
+    from a_Config.enumerations.hospital_enum import Hospital
+
+    hospital_metadata = read_config_csv('hospital_metadata.csv').set_index(['Organization', 'State'])
+    hospital_metadata.index = hospital_metadata.index.set_levels(
+        hospital_metadata.index.levels[0].map(Hospital), level=0
+    ).set_levels(
+        hospital_metadata.index.levels[1].map(State), level=1
+    )
+    return hospital_metadata
 
-def _build_systems_map() -> Dict[tuple[HealthSystem, State], set[Hospital]]:
-    df = HOSPITAL_METADATA.reset_index()
+@register_config('SYSTEMS_TO_HOSPITALS_MAP')
+def _build_systems_map() -> Dict[tuple['HealthSystem', State], set['Hospital']]:
+    from a_Config.enumerations.hospital_enum import HealthSystem
+
+    df = get_config('HOSPITAL_METADATA').reset_index()
     missing = df[df['Healthcare System'].isna()]['Organization'].tolist()
     if missing:
         raise ValueError(f"Organizations missing a Healthcare System: {missing}. If independent, label Non-Affiliated.")
     df['Healthcare System'] = df['Healthcare System'].map(HealthSystem)
     return df.groupby(['Healthcare System', 'State'])['Organization'].apply(set).to_dict()
 
-SYSTEMS_TO_HOSPITALS_MAP: Dict[tuple[HealthSystem, State], set[Hospital]] = _build_systems_map()
-
 #######################################################################################################
 # Helper Functions
 #######################################################################################################
@@ -89,11 +175,11 @@ def get_measure_tickformat(measure: str, is_level: bool, is_pct: bool = False) -
     'Millions' measures (balance sheet)    → '$,.1f'  (e.g. 1234567 → '$1,234,567.0')
     Unknown measures default to '.1f'.
     """
-    is_pct_change = (not is_level) & (measure in LINE_ITEMS)
+    is_pct_change = (not is_level) & (measure in get_config('LINE_ITEMS'))
     if is_pct | is_pct_change:
         return '.1%'
-    elif measure in FINANCIAL_STATEMENT_MODEL.index:
-        fmt = FINANCIAL_STATEMENT_MODEL.loc[measure, 'Format']
+    elif measure in get_config('FINANCIAL_STATEMENT_MODEL').index:
+        fmt = get_config('FINANCIAL_STATEMENT_MODEL').loc[measure, 'Format']
         match fmt:
             case 'Percent':
                 return '.1%'
@@ -6,7 +6,8 @@ from a_Config.enumerations.interface_fields_enum import InterfaceFields
 from a_Config.global_constants import DERIVE_RATIOS, LINE_ITEMS, ALL_RATIOS, SYSTEMS_TO_HOSPITALS_MAP, INCOME_STATEMENT_MEASURES, BALANCE_SHEET_MEASURES, get_measure_tickformat
 from a_Config.enumerations import *
 from a_Config.fin_statement_model_utils import OTHER_MEASURES, get_fin_statement_descendants
-from e_Data_Pipelines.e_run_full_entity_pipeline import run_full_entity_pipeline
+from c_Fin_Statement_Processing.g_pipeline_cache import PIPELINE_CACHE
+from e_Data_Pipelines.e_run_full_entity_pipeline import APP_PIPELINE_CACHE_BYTES, MA_WINDOWS, run_full_entity_pipeline, select_ma_window
 from f_Aggregations.aggregations import create_failed_dataset, calc_population_aggregates, calc_aggregates
 from e_Data_Pipelines.c_change_pipeline import calc_pct_changes
 from g_Visualizations.failed_histogram import plot_failed_histogram
@@ -24,13 +25,17 @@ st.set_page_config(
     layout="wide"
 )
 
+PIPELINE_CACHE.resize(APP_PIPELINE_CACHE_BYTES)
+
 #######################################################################################################
 # Cached pipeline helpers
 #######################################################################################################
 
 @st.cache_data
 def _build_entity_datasets(states: tuple, num_years_ma: int, entities: frozenset, year_begin=None, year_end=None):
-    return run_full_entity_pipeline(list(states), num_years_ma, entities=entities, year_start=year_begin, year_end=year_end)
+    # Every lookback window is computed (and memoized) at once; the slider only picks a slice
+    datasets = run_full_entity_pipeline(list(states), MA_WINDOWS, entities=entities, year_start=year_begin, year_end=year_end)
+    return tuple(select_ma_window(ds, num_years_ma) for ds in datasets)
 
 
 @st.cache_data
@@ -119,7 +124,7 @@ else:
 
 num_years_ma = st.sidebar.number_input(
     'Lookback Years',
-    1, 10, 5,
+    min(MA_WINDOWS), max(MA_WINDOWS), 5,
     help="Controls the number of years for the moving average and in the leadup to failure chart."
 )
 
@@ -1,7 +1,11 @@
 import os
+from functools import partial
+import numpy as np
 import pandas as pd
 from a_Config.enumerations.state_enum import State
 from a_Config.enumerations.hospital_enum import to_entity
+from b_Ingest.ingest_file_cache import load_file_with_cache
+from b_Ingest.ingest_workers import map_per_file
 from a_Config.global_constants import (
     ORG_MAPPINGS_ME,
     MEASURE_MAPPINGS,
@@ -90,17 +94,17 @@ def augment_input_df_with_parent(df: pd.DataFrame) -> pd.DataFrame:
     ]
     
     df_reset = df.reset_index()
-    df_reset["Parent"] = ""
-    
-    for hospital, group in df_reset.groupby("Organization"):
-        current_parent = None
-        for idx in group.index:
-            measure = df_reset.at[idx, "Measure"]
-            if measure in parent_measures:
-                df_reset.at[idx, "Parent"] = ""
-                current_parent = measure
-            else:
-                df_reset.at[idx, "Parent"] = current_parent if current_parent else ""
+
+    # Mark rows that open a new parent section, then carry the most recent
+    # marker forward within each organization (rows keep their scraped order).
+    is_parent = df_reset["Measure"].isin(parent_measures)
+    section_parent = (
+        df_reset["Measure"]
+        .where(is_parent)
+        .groupby(df_reset["Organization"], sort=False)
+        .ffill()
+    )
+    df_reset["Parent"] = section_parent.mask(is_parent, "").fillna("")
     
     # Set new MultiIndex
     df_aug = df_reset.set_index(["Organization", "Measure", "Parent"])
@@ -123,7 +127,7 @@ def process_financial_input_df(df: pd.DataFrame) -> pd.DataFrame:
 
 def rename_measures_by_hierarchy(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Renames measures based on MEASURE_HIERAERCHY_RENAMES mapping using (Measure, Parent) key.
+    Renames measures based on MEASURE_HIERARCHY_RENAMES mapping using (Measure, Parent) key.
     Output keyed on (Organization, Measure) with all pairs unique.
 
     Args:
@@ -132,12 +136,16 @@ def rename_measures_by_hierarchy(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Output with MultiIndex (Organization, Measure)
     """
-    hierarchy_renames = MEASURE_HIERARCHY_RENAMES
-    df_reset = df.reset_index()
-    df_reset['Measure'] = df_reset.apply(
-        lambda row: hierarchy_renames.get((row['Measure'], row['Parent']), row['Measure']),
-        axis=1
+    hierarchy_renames = pd.Series(
+        list(MEASURE_HIERARCHY_RENAMES.values()),
+        index=pd.MultiIndex.from_tuples(list(MEASURE_HIERARCHY_RENAMES), names=['Measure', 'Parent']),
+        dtype=object,
     )
+    df_reset = df.reset_index()
+
+    # Single indexed lookup on the (Measure, Parent) key; unmatched rows keep their name
+    new_names = hierarchy_renames.reindex(pd.MultiIndex.from_frame(df_reset[['Measure', 'Parent']]))
+    df_reset['Measure'] = df_reset['Measure'].where(new_names.isna().to_numpy(), new_names.to_numpy())
     df_renamed = df_reset.set_index(['Organization', 'Measure'])
     df_renamed = df_renamed.drop(columns=['Parent'])
 
@@ -146,42 +154,103 @@ def rename_measures_by_hierarchy(df: pd.DataFrame) -> pd.DataFrame:
     return df_renamed
 
 
-def create_combined_me_financial_df(directory: str, file_list: list[str]) -> pd.DataFrame:
+def merge_by_file_precedence(dfs: list[pd.DataFrame], sources: list[str]) -> pd.DataFrame:
+    """
+    Merges per-file wide DataFrames in a single pass with "first file wins" precedence:
+    - Aligns every file once onto the union (Organization, Measure) x Year grid
+    - Stacks them along a file-rank axis
+    - Takes, per cell, the value from the lowest-ranked file that has one
+
+    Equivalent to folding the files together with combine_first followed by
+    stack(dropna=False), without realigning and copying the growing frame per file.
+
+    Args:
+        dfs (list[pd.DataFrame]): Processed DataFrames with MultiIndex (Organization, Measure)
+            and year columns, in precedence order
+        sources (list[str]): Name of the file each DataFrame came from
+
+    Returns:
+        pd.DataFrame: MultiIndex (Organization, Measure, Year) with columns 'Value' and
+        'Source' (the file that supplied the value, NaN where no file has one)
+    """
+    rows = dfs[0].index
+    for df in dfs[1:]:
+        rows = rows.union(df.index)
+    years = sorted(set().union(*(df.columns for df in dfs)))
+
+    # (file rank, row, year)
+    values_by_rank = np.stack([
+        df.reindex(index=rows, columns=years).to_numpy(dtype=float) for df in dfs
+    ])
+    present = ~np.isnan(values_by_rank)
+    winning_rank = present.argmax(axis=0)
+    values = np.take_along_axis(values_by_rank, winning_rank[np.newaxis], axis=0)[0]
+    source = np.where(present.any(axis=0), np.asarray(sources, dtype=object)[winning_rank], np.nan)
+
+    rows = rows.remove_unused_levels()
+    index = pd.MultiIndex(
+        levels=[rows.levels[0], rows.levels[1], pd.Index(years).astype(int)],
+        codes=[
+            np.repeat(rows.codes[0], len(years)),
+            np.repeat(rows.codes[1], len(years)),
+            np.tile(np.arange(len(years)), len(rows)),
+        ],
+        names=['Organization', 'Measure', 'Year'],
+    )
+    return pd.DataFrame({'Value': values.ravel(), 'Source': source.ravel()}, index=index)
+
+
+def ingest_and_process_csv(file_path: str) -> pd.DataFrame:
+    """
+    Reads and fully processes a single ME CSV file (ingest_single_csv followed by
+    process_financial_input_df).
+
+    Args:
+        file_path (str): Path to the CSV file
+
+    Returns:
+        pd.DataFrame: Processed DataFrame keyed on (Organization, Measure) with year columns
+    """
+    return process_financial_input_df(ingest_single_csv(file_path))
+
+
+def create_combined_me_financial_df(
+    directory: str,
+    file_list: list[str],
+    include_source: bool = False,
+    max_workers: int | None = None,
+    incremental: bool = False,
+) -> pd.DataFrame:
     """
     Stitches multiple CSV files together:
-    - Ingests each (read + index)
-    - Cleans each
-    - Concatenates horizontally into combined_df
+    - Ingests each (read + index), on a thread pool if max_workers is set
+    - Cleans each, on a process pool if max_workers is set
+    - Merges them with merge_by_file_precedence (earlier files in file_list win)
 
     Args:
         directory (str): Directory containing CSV files
-        file_list (list[str]): List of CSV filenames
-        entity (str): First index column (default: 'Organization')
-        measure (str): Second index column (default: 'Ratio')
+        file_list (list[str]): List of CSV filenames, in precedence order
+        include_source (bool): Keep the 'Source' column recording which file supplied
+            each value (default: False)
+        max_workers (int | None): Worker count for per-file ingest. None or 1 runs
+            sequentially (default)
+        incremental (bool): Reuse cached per-file frames for files that have not changed,
+            so only new or modified files are re-parsed before the merge (default: False)
 
     Returns:
         pd.DataFrame: Combined, cleaned DataFrame ready for analysis
     """
-    dfs = []
-    for file in file_list:
-        file_path = os.path.join(directory, file)
-        df_ingest = ingest_single_csv(file_path)
-        df_clean = process_financial_input_df(df_ingest)
-        dfs.append(df_clean)
+    file_paths = [os.path.join(directory, file) for file in file_list]
+    if incremental:
+        load_file = partial(load_file_with_cache, process=ingest_and_process_csv)
+        dfs = map_per_file(load_file, file_paths, max_workers=max_workers, use_processes=True)
+    else:
+        raw_dfs = map_per_file(ingest_single_csv, file_paths, max_workers=max_workers)
+        dfs = map_per_file(process_financial_input_df, raw_dfs, max_workers=max_workers, use_processes=True)
 
-    combined_df = dfs[0]
-    for df in dfs[1:]:
-        combined_df = combined_df.combine_first(df)
+    combined_df = merge_by_file_precedence(dfs, file_list)
 
-    combined_df = (
-        combined_df
-        .stack(dropna=False)
-        .rename('Value')
-        .to_frame()
-    )
-    combined_df.index.names = ['Organization', 'Measure', 'Year']
-    combined_df.index = combined_df.index.set_levels(
-        combined_df.index.levels[2].astype(int), level='Year'
-    )
+    if not include_source:
+        combined_df = combined_df.drop(columns=['Source'])
 
     return combined_df
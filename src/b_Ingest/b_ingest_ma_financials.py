@@ -1,8 +1,11 @@
 import os
 import re
+from functools import partial
 import pandas as pd
 from a_Config.enumerations.state_enum import State
 from a_Config.enumerations.hospital_enum import Hospital
+from b_Ingest.ingest_file_cache import load_file_with_cache
+from b_Ingest.ingest_workers import map_per_file
 
 
 MA_FINANCIALS_DIR = os.path.join("src", "z_Data", "Raw_Data", "MA Financials")
@@ -61,24 +64,40 @@ def _extract_year(filename: str) -> int:
     return int(match.group(1))
 
 
-def _parse_dollar_value(val) -> float:
-    if pd.isna(val):
-        return float('nan')
-    s = str(val).strip()
-    negative = s.startswith('(') and s.endswith(')')
-    if negative:
-        s = s[1:-1]
-    s = s.replace('$', '').replace(',', '').replace('%', '')
+# Plain decimal / scientific notation, after '$', ',', '%' and parentheses are stripped
+_NUMERIC_PATTERN = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+
+
+def _parse_dollar_column(col: pd.Series) -> pd.Series:
+    s = col.astype('string[pyarrow]').str.strip()
+    negative = (s.str.startswith('(') & s.str.endswith(')')).fillna(False)
+    s = s.mask(negative, s.str.slice(1, -1))
+    s = (
+        s.str.replace('$', '', regex=False)
+        .str.replace(',', '', regex=False)
+        .str.replace('%', '', regex=False)
+        .str.strip()
+    )
+    is_numeric = s.str.fullmatch(_NUMERIC_PATTERN).fillna(False)
+    result = s.where(is_numeric).astype(float)
+    # The few tokens the pattern rejects ('inf', '1_000', text) fall back to float()
+    leftover = s.notna() & ~is_numeric
+    if leftover.any():
+        result[leftover] = s[leftover].map(_parse_float_token).astype(float)
+    return result.mask(negative, -result)
+
+
+def _parse_float_token(token: str) -> float:
     try:
-        result = float(s)
-        return -result if negative else result
+        return float(token)
     except ValueError:
         return float('nan')
 
 
 def parse_ma_numeric_values(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Converts dollar-formatted string values to floats.
+    Converts dollar-formatted string values to floats, one column at a time
+    with pandas string operations.
     Handles: "$1,234,567" → 1234567.0, "($1,234,567)" → -1234567.0.
     Non-parseable values (ratios, percentages, etc.) become NaN.
 
@@ -89,7 +108,7 @@ def parse_ma_numeric_values(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with the same structure and float values.
     """
-    return df.apply(lambda col: col.map(_parse_dollar_value))
+    return df.apply(_parse_dollar_column)
 
 
 def clean_ma_measure_names(df: pd.DataFrame) -> pd.DataFrame:
@@ -136,12 +155,13 @@ def apply_and_validate_org_renames(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.copy()
     df = df.dropna(subset=['Organization Name'])
-    df['Organization Name'] = df.apply(
-        lambda row: HOSPITAL_RENAMES_MA.get(
-            (row['Organization Name'], row['Org ID']), row['Organization Name']
-        ),
-        axis=1,
+    org_renames = pd.Series(
+        list(HOSPITAL_RENAMES_MA.values()),
+        index=pd.MultiIndex.from_tuples(list(HOSPITAL_RENAMES_MA), names=['Organization Name', 'Org ID']),
+        dtype=object,
     )
+    new_names = org_renames.reindex(pd.MultiIndex.from_frame(df[['Organization Name', 'Org ID']]))
+    df['Organization Name'] = df['Organization Name'].where(new_names.isna().to_numpy(), new_names.to_numpy())
 
     duplicates = df[df.duplicated('Organization Name', keep=False)]['Organization Name'].unique()
     if len(duplicates) > 0:
@@ -152,14 +172,60 @@ def apply_and_validate_org_renames(df: pd.DataFrame) -> pd.DataFrame:
     return df.drop(columns=['Org ID']).rename(columns={'Organization Name': 'Organization'})
 
 
-def create_combined_ma_financial_df(directory: str = MA_FINANCIALS_DIR) -> pd.DataFrame:
+def process_ma_input_df(df_raw: pd.DataFrame, year: int) -> pd.DataFrame:
+    """
+    Full processing pipeline for a single raw MA financials DataFrame:
+    - Applies and validates organization renames
+    - Transposes to (Organization, Measure, Year) long format
+    - Parses dollar-formatted strings to floats
+
+    Args:
+        df_raw: Raw DataFrame from ingest_single_csv.
+        year: The fiscal year represented by this file.
+
+    Returns:
+        DataFrame with MultiIndex (Organization, Measure, Year) and float values.
+    """
+    df_raw = apply_and_validate_org_renames(df_raw)
+    df_transposed = transpose_to_hospital_measure(df_raw, year)
+    return parse_ma_numeric_values(df_transposed)
+
+
+def ingest_and_process_csv(file_path: str) -> pd.DataFrame:
+    """
+    Reads and fully processes a single MA financials CSV, taking the fiscal
+    year from the filename.
+
+    Args:
+        file_path: Path to the CSV file.
+
+    Returns:
+        DataFrame with MultiIndex (Organization, Measure, Year) and float values.
+    """
+    year = _extract_year(os.path.basename(file_path))
+    return process_ma_input_df(ingest_single_csv(file_path), year)
+
+
+def create_combined_ma_financial_df(
+    directory: str = MA_FINANCIALS_DIR,
+    max_workers: int | None = None,
+    incremental: bool = False,
+) -> pd.DataFrame:
     """
     Ingests all MA financials CSVs in directory, transposes each to
     (Org ID, Organization Name, Measure) x year format, and merges across
     years into a single DataFrame.
 
+    Files are read on a thread pool and processed on a process pool when
+    max_workers is set; results are concatenated in filename order either way.
+
     Args:
         directory: Path to directory containing MA financials CSVs.
+        max_workers: Worker count for per-file ingest. None or 1 runs
+            sequentially (default).
+        incremental: Reuse cached per-file frames for files that have not
+            changed, so adding a new year's databook only parses that file
+            (default: False).
 
     Returns:
         DataFrame with MultiIndex (Organization, Measure) and
@@ -169,15 +235,15 @@ def create_combined_ma_financial_df(directory: str = MA_FINANCIALS_DIR) -> pd.Da
     if not csv_files:
         raise FileNotFoundError(f"No CSV files found in: {directory}")
 
-    dfs = []
-    for filename in csv_files:
-        year = _extract_year(filename)
-        file_path = os.path.join(directory, filename)
-        df_raw = ingest_single_csv(file_path)
-        df_raw = apply_and_validate_org_renames(df_raw)
-        df_transposed = transpose_to_hospital_measure(df_raw, year)
-        df_dollars_parsed = parse_ma_numeric_values(df_transposed)
-        dfs.append(df_dollars_parsed)
+    file_paths = [os.path.join(directory, filename) for filename in csv_files]
+
+    if incremental:
+        load_file = partial(load_file_with_cache, process=ingest_and_process_csv)
+        dfs = map_per_file(load_file, file_paths, max_workers=max_workers, use_processes=True)
+    else:
+        years = [_extract_year(filename) for filename in csv_files]
+        raw_dfs = map_per_file(ingest_single_csv, file_paths, max_workers=max_workers)
+        dfs = map_per_file(process_ma_input_df, raw_dfs, years, max_workers=max_workers, use_processes=True)
 
     combined = pd.concat(dfs, axis=0)
     combined = clean_ma_measure_names(combined)
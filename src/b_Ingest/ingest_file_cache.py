@@ -0,0 +1,60 @@
+"""
+Per-file cache of ingested intermediate frames, used for incremental ingest.
+
+Each raw input file's processed frame is stored under a fingerprint of the
+file's contents, every csv_configs/*.csv and the source of the code that
+processes it. When a new year's file is added (or one is edited), only that
+file is re-parsed; every other file is served from the cache and the
+downstream merge is re-run over all of them.
+"""
+import glob
+import hashlib
+import os
+import pandas as pd
+from typing import Callable
+from a_Config.cache_io import atomic_write, hash_files, source_fingerprint
+from a_Config.global_constants import MAPPINGS_DIR
+
+INGEST_CACHE_DIR = os.path.join("src", "z_Data", "Processed_Cache", "files")
+
+
+def get_config_files() -> list[str]:
+    return sorted(glob.glob(os.path.join(MAPPINGS_DIR, '*.csv')))
+
+
+def load_file_with_cache(
+    file_path: str,
+    process: Callable[[str], pd.DataFrame],
+    cache_dir: str = INGEST_CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Returns process(file_path), reusing the cached result when neither the file,
+    any csv_configs/*.csv nor the source of process's module and the modules it
+    imports (see source_fingerprint) has changed since it was stored.
+
+    Entries are pickled rather than written as Parquet so the enum-typed index
+    levels and year column labels round-trip exactly. Older entries for the same
+    file and process are removed when a new one is written.
+
+    Args:
+        file_path: Raw input file.
+        process: Module-level function that ingests and processes one file.
+        cache_dir: Directory holding the cached frames.
+
+    Returns:
+        The processed DataFrame for file_path.
+    """
+    files_hash = hash_files([file_path] + get_config_files())
+    code_hash = source_fingerprint(process.__module__)
+    key = hashlib.sha256(f"{code_hash}:{files_hash}".encode()).hexdigest()
+    prefix = f"{process.__module__}.{process.__name__}__{os.path.basename(file_path)}"
+    path = os.path.join(cache_dir, f"{prefix}__{key[:16]}.pkl")
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    df = process(file_path)
+
+    for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(prefix)}__*.pkl")):
+        os.remove(stale)
+    atomic_write(path, df.to_pickle)
+    return df
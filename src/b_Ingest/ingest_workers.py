@@ -0,0 +1,29 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+
+def map_per_file(func: Callable, *iterables: Iterable, max_workers: int | None = None, use_processes: bool = False) -> list:
+    """
+    Applies func to each file's arguments, optionally on a worker pool.
+
+    Files are independent until they are merged, so they can be read and cleaned
+    concurrently. Results are always returned in input order regardless of which
+    file finishes first, so downstream merges stay deterministic.
+
+    Args:
+        func: Function to apply. Must be a module-level function when use_processes is True.
+        *iterables: Per-file arguments, zipped together as in map().
+        max_workers: Pool size. None or 1 runs sequentially in the calling thread (default).
+        use_processes: Use a process pool (for pandas-heavy cleaning) instead of a
+            thread pool (for I/O).
+
+    Returns:
+        List of func results, one per file, in input order.
+    """
+    args = list(zip(*iterables))
+    if not max_workers or max_workers <= 1 or len(args) <= 1:
+        return [func(*a) for a in args]
+
+    executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor(max_workers=min(max_workers, len(args))) as pool:
+        return list(pool.map(func, *zip(*args)))
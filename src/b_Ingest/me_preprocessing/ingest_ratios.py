@@ -1,11 +1,11 @@
+import argparse
 import re
-import sys
 import pandas as pd
-from b_Ingest.me_preprocessing.pdf_parse_helpers import parse_hospital_name, parse_years
-import pdfplumber
+from typing import Iterator
+from b_Ingest.me_preprocessing.pdf_parse_helpers import iter_page_texts, parse_hospital_name, parse_years, write_rows_in_batches
 
 
-def ingest_ratios(pdf_path: str, output_base: str) -> pd.DataFrame:
+def iter_ratio_rows(pdf_path: str, output_base: str, workers: int = 1, use_text_cache: bool = True) -> Iterator[dict]:
     max_pad = 4 if 'health' in output_base else 5
 
     def clean_value(value):
@@ -20,81 +20,83 @@ def ingest_ratios(pdf_path: str, output_base: str) -> pd.DataFrame:
         match = re.search(r'[-+]?\d*\.?\d+', value)
         return float(match.group()) if match else None
 
-    data = []
     current_hospital = None
     start_parsing = False
     years = ['2020', '2021', '2022', '2023', '2024']
     years_parsed = False
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            try:
-                text = page.extract_text()
-                if not text:
-                    continue
-                lines = text.split('\n')
-                if not lines:
-                    continue
+    for page_num, text in enumerate(iter_page_texts(pdf_path, workers, use_text_cache)):
+        try:
+            if not text:
+                continue
+            lines = text.split('\n')
+            if not lines:
+                continue
 
-                current_hospital = parse_hospital_name(lines, current_hospital)
-                print(f"Processing {current_hospital}")
+            current_hospital = parse_hospital_name(lines, current_hospital)
+            print(f"Processing {current_hospital}")
 
-                if 'RATIOS' in text:
-                    start_parsing = True
-                should_parse = 'RATIOS' in text or (current_hospital and start_parsing)
+            if 'RATIOS' in text:
+                start_parsing = True
+            should_parse = 'RATIOS' in text or (current_hospital and start_parsing)
 
-                if should_parse and start_parsing:
-                    if not years_parsed:
-                        parsed = parse_years(lines)
-                        if parsed:
-                            years = parsed
-                            years_parsed = True
+            if should_parse and start_parsing:
+                if not years_parsed:
+                    parsed = parse_years(lines)
+                    if parsed:
+                        years = parsed
+                        years_parsed = True
 
-                    in_ratios = False
-                    current_category = None
-                    for line in lines:
-                        line = line.strip()
-                        if 'RATIOS' in line:
-                            in_ratios = True
+                in_ratios = False
+                current_category = None
+                for line in lines:
+                    line = line.strip()
+                    if 'RATIOS' in line:
+                        in_ratios = True
+                        continue
+                    if not in_ratios:
+                        continue
+                    if not line:
+                        continue
+                    if not re.search(r'\d', line) and len(line) > 3:
+                        current_category = line
+                        continue
+                    if re.search(r'\d', line):
+                        parts = line.split()
+                        if len(parts) < 2:
                             continue
-                        if not in_ratios:
+                        value_start = None
+                        special_chars = ['†', '', '-', '(cid:132)', 'Ä†', 'N/A', 'n/a', 'NA', 'na']
+                        for i, part in enumerate(parts):
+                            if re.match(r'^-?(\d|\.)|\(', part) or part in special_chars:
+                                value_start = i
+                                break
+                        if value_start is None or value_start == 0:
                             continue
-                        if not line:
+                        units = ['rate', 'days', 'years']
+                        if value_start > 1 and parts[value_start - 1] in units:
+                            ratio_name = ' '.join(parts[:value_start - 1])
+                        else:
+                            ratio_name = ' '.join(parts[:value_start])
+                        if any(kw in ratio_name for kw in ('FY', 'Unit', 'Consolidated')):
                             continue
-                        if not re.search(r'\d', line) and len(line) > 3:
-                            current_category = line
-                            continue
-                        if re.search(r'\d', line):
-                            parts = line.split()
-                            if len(parts) < 2:
-                                continue
-                            value_start = None
-                            special_chars = ['†', '', '-', '(cid:132)', 'Ä†', 'N/A', 'n/a', 'NA', 'na']
-                            for i, part in enumerate(parts):
-                                if re.match(r'^-?(\d|\.)|\(', part) or part in special_chars:
-                                    value_start = i
-                                    break
-                            if value_start is None or value_start == 0:
-                                continue
-                            units = ['rate', 'days', 'years']
-                            if value_start > 1 and parts[value_start - 1] in units:
-                                ratio_name = ' '.join(parts[:value_start - 1])
-                            else:
-                                ratio_name = ' '.join(parts[:value_start])
-                            if any(kw in ratio_name for kw in ('FY', 'Unit', 'Consolidated')):
-                                continue
-                            value_parts = parts[value_start:]
-                            while len(value_parts) < max_pad:
-                                value_parts.append(None)
-                            value_parts = value_parts[:max_pad]
-                            values = [clean_value(v) for v in value_parts]
-                            row = {'Organization': current_hospital, 'Measure': ratio_name}
-                            for i, val in enumerate(values):
-                                row[f'FY {years[i] if i < len(years) else str(2020 + i)}'] = val
-                            data.append(row)
-            except Exception as e:
-                print(f"Error processing page {page_num + 1}: {e}")
+                        value_parts = parts[value_start:]
+                        while len(value_parts) < max_pad:
+                            value_parts.append(None)
+                        value_parts = value_parts[:max_pad]
+                        values = [clean_value(v) for v in value_parts]
+                        row = {'Organization': current_hospital, 'Measure': ratio_name}
+                        for i, val in enumerate(values):
+                            row[f'FY {years[i] if i < len(years) else str(2020 + i)}'] = val
+                        yield row
+        except Exception as e:
+            print(f"Error processing page {page_num + 1}: {e}")
+
 
+def ingest_ratios(pdf_path: str, output_base: str, workers: int = 1, use_text_cache: bool = True) -> pd.DataFrame:
+    data = list(iter_ratio_rows(pdf_path, output_base, workers, use_text_cache))
+    if not data:
+        raise ValueError(f"No ratio rows were parsed from {pdf_path}.")
     df = pd.DataFrame(data).set_index(['Organization', 'Measure'])
     print(f"Successfully extracted {len(df)} ratio records from {len(df.index.levels[0])} hospitals")
     df.to_csv(f'src/z_Data/Preprocessed_Data/{output_base}.csv')
@@ -102,7 +104,26 @@ def ingest_ratios(pdf_path: str, output_base: str) -> pd.DataFrame:
     return df
 
 
+def ingest_ratios_streaming(pdf_path: str, output_base: str, workers: int = 1, use_text_cache: bool = True, batch_size: int = 500) -> int:
+    """
+    Same output as ingest_ratios, but rows are written to the CSV in batches as pages are
+    parsed instead of being held in memory, so peak memory stays flat with page count.
+    Returns the number of rows written.
+    """
+    rows = iter_ratio_rows(pdf_path, output_base, workers, use_text_cache)
+    num_rows, num_orgs = write_rows_in_batches(rows, f'src/z_Data/Preprocessed_Data/{output_base}.csv', batch_size)
+    print(f"Successfully extracted {num_rows} ratio records from {num_orgs} hospitals")
+    print(f"Saved to src/z_Data/Preprocessed_Data/{output_base}.csv")
+    return num_rows
+
+
 if __name__ == '__main__':
-    _pdf_path = sys.argv[1] if len(sys.argv) > 1 else 'src/z_Data/Raw_Data/ME/ME_Hospital/Report_B_FY24_All_Financial_Hosp_251231.pdf'
-    _output_base = sys.argv[2] if len(sys.argv) > 2 else 'hospital'
-    ingest_ratios(_pdf_path, _output_base)
+    _parser = argparse.ArgumentParser()
+    _parser.add_argument('pdf_path', nargs='?', default='src/z_Data/Raw_Data/ME/ME_Hospital/Report_B_FY24_All_Financial_Hosp_251231.pdf')
+    _parser.add_argument('output_base', nargs='?', default='hospital')
+    _parser.add_argument('--workers', type=int, default=1, help='Processes used to extract page text in parallel.')
+    _parser.add_argument('--no-text-cache', action='store_true', help='Re-extract page text instead of reusing the cached text.')
+    _parser.add_argument('--stream', action='store_true', help='Write the CSV in batches instead of holding every row in memory.')
+    _args = _parser.parse_args()
+    _ingest = ingest_ratios_streaming if _args.stream else ingest_ratios
+    _ingest(_args.pdf_path, _args.output_base, _args.workers, not _args.no_text_cache)
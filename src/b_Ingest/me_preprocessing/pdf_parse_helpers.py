@@ -1,4 +1,18 @@
+import csv
+import json
+import os
 import re
+import pandas as pd
+import pdfplumber
+from itertools import islice
+from typing import Iterable, Iterator
+from a_Config.cache_io import atomic_write, file_digest
+from b_Ingest.ingest_workers import map_per_file
+
+PDF_TEXT_CACHE_DIR = os.path.join("src", "z_Data", "Processed_Cache", "pdf_text")
+
+# Contiguous page ranges handed to each worker; several per worker to even out uneven pages
+_CHUNKS_PER_WORKER = 4
 
 
 def parse_hospital_name(lines: list[str], current_hospital: str | None) -> str | None:
@@ -25,3 +39,130 @@ def parse_years(lines: list[str]) -> list[str] | None:
             if years:
                 return years
     return None
+
+
+def _extract_page_text(page) -> str:
+    text = page.extract_text()
+    # Drop the page's cached layout objects so memory doesn't grow with page count
+    page.close()
+    return text
+
+
+def _extract_pages(pdf_path: str, page_nums: list[int]) -> list[str | None]:
+    texts = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in page_nums:
+            try:
+                texts.append(_extract_page_text(pdf.pages[page_num]))
+            except Exception as e:
+                print(f"Error processing page {page_num + 1}: {e}")
+                texts.append(None)
+    return texts
+
+
+def _read_text_cache(cache_path: str) -> dict[int, str]:
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, encoding='utf-8') as f:
+        cached = json.load(f)
+    if cached.get('pdfplumber_version') != pdfplumber.__version__:
+        return {}
+    return {int(page_num): text for page_num, text in cached['pages'].items()}
+
+
+def _write_text_cache(cache_path: str, page_texts: dict[int, str]) -> None:
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pdfplumber_version': pdfplumber.__version__, 'pages': page_texts}, f)
+    atomic_write(cache_path, write)
+
+
+def iter_page_texts(pdf_path: str, workers: int = 1, use_cache: bool = True) -> Iterator[str | None]:
+    """
+    Yields the text of every page of a PDF, in page order.
+
+    Layout analysis is the expensive part of ingest and has no cross-page state,
+    so with workers > 1 contiguous page ranges are extracted in a process pool.
+    With one worker pages are extracted lazily, one at a time, releasing each
+    page's layout cache before moving on.
+
+    Extracted text is cached on disk keyed by the PDF's content hash and page
+    number, so re-running the parsers after a regex tweak skips pdfplumber entirely.
+    Pages that fail to extract are yielded as None and are not cached.
+    """
+    cache_path = os.path.join(PDF_TEXT_CACHE_DIR, f"{file_digest(pdf_path).hex()}.json")
+    page_texts = _read_text_cache(cache_path) if use_cache else {}
+    num_cached = len(page_texts)
+
+    with pdfplumber.open(pdf_path) as pdf:
+        num_pages = len(pdf.pages)
+        if num_pages == 0:
+            return
+        missing = [page_num for page_num in range(num_pages) if page_num not in page_texts]
+
+        if workers > 1 and missing:
+            num_chunks = min(len(missing), workers * _CHUNKS_PER_WORKER)
+            bounds = [round(i * len(missing) / num_chunks) for i in range(num_chunks + 1)]
+            chunks = [missing[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+            extracted = map_per_file(
+                _extract_pages, [pdf_path] * num_chunks, chunks,
+                max_workers=workers, use_processes=True,
+            )
+            for page_nums, texts in zip(chunks, extracted):
+                page_texts.update({n: t for n, t in zip(page_nums, texts) if t is not None})
+
+        for page_num in range(num_pages):
+            if page_num not in page_texts and workers <= 1:
+                try:
+                    page_texts[page_num] = _extract_page_text(pdf.pages[page_num])
+                except Exception as e:
+                    print(f"Error processing page {page_num + 1}: {e}")
+            yield page_texts.get(page_num)
+
+    if use_cache and len(page_texts) > num_cached:
+        _write_text_cache(cache_path, page_texts)
+
+
+def _widen_csv(csv_path: str, header: list[str]) -> None:
+    """Rewrites csv_path under a wider header, padding existing rows with empty cells (as to_csv writes NaN)."""
+    with open(csv_path, newline='') as f:
+        lines = list(csv.reader(f))[1:]
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(header)
+        writer.writerows(line + [''] * (len(header) - len(line)) for line in lines)
+
+
+def write_rows_in_batches(rows: Iterable[dict], csv_path: str, batch_size: int = 500) -> tuple[int, int]:
+    """
+    Writes row dicts keyed on (Organization, Measure) to csv_path batch by batch,
+    producing the same file as pd.DataFrame(rows).set_index([...]).to_csv(csv_path).
+
+    Columns are ordered by first appearance across all rows. When a later batch
+    introduces a column, the rows already written are padded with empty cells and
+    the header is rewritten, so rows may carry different keys, as with the DataFrame.
+
+    Returns:
+        Tuple of (rows written, distinct organizations).
+
+    Raises:
+        ValueError: If rows is empty. Nothing is written, so a CSV from an earlier
+            run is never mistaken for this one's output.
+    """
+    num_rows = 0
+    organizations = set()
+    columns = []
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        df = pd.DataFrame(batch)
+        new_columns = [c for c in df.columns if c not in columns]
+        columns += new_columns
+        df = df.reindex(columns=columns).set_index(['Organization', 'Measure'])
+        if num_rows and new_columns:
+            _widen_csv(csv_path, list(df.index.names) + list(df.columns))
+        df.to_csv(csv_path, mode='w' if num_rows == 0 else 'a', header=num_rows == 0)
+        num_rows += len(df)
+        organizations.update(df.index.get_level_values('Organization').dropna())
+    if num_rows == 0:
+        raise ValueError(f"No rows to write; {csv_path} was left unchanged.")
+    return num_rows, len(organizations)
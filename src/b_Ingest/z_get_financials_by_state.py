@@ -21,18 +21,33 @@ _ME_HEALTH_SYSTEMS_FILES = [
 ]
 _ME_FILES = _ME_HOSPITAL_FILES + _ME_HEALTH_SYSTEMS_FILES
 
+_SOURCE_FILES_DISPATCH = {
+    State.ME: lambda: [os.path.join(_ME_DIR, f) for f in _ME_FILES],
+    State.MA: lambda: sorted(
+        os.path.join(MA_FINANCIALS_DIR, f) for f in os.listdir(MA_FINANCIALS_DIR) if f.endswith('.csv')
+    ),
+}
+
 _STATE_DISPATCH = {
-    State.ME: lambda: create_combined_me_financial_df(_ME_DIR, _ME_FILES),
-    State.MA: lambda: create_combined_ma_financial_df(MA_FINANCIALS_DIR),
+    State.ME: lambda max_workers, incremental: create_combined_me_financial_df(
+        _ME_DIR, _ME_FILES, max_workers=max_workers, incremental=incremental
+    ),
+    State.MA: lambda max_workers, incremental: create_combined_ma_financial_df(
+        MA_FINANCIALS_DIR, max_workers=max_workers, incremental=incremental
+    ),
 }
 
 
-def get_financials_by_state(state: State) -> pd.DataFrame:
+def get_financials_by_state(state: State, max_workers: int | None = None, incremental: bool = False) -> pd.DataFrame:
     """
     Returns the combined financial DataFrame for the given state.
 
     Args:
         state: State enum member.
+        max_workers: Worker count for parallel per-file ingest. None or 1 runs
+            sequentially (default).
+        incremental: Only re-parse source files that are new or changed since
+            they were last ingested, reusing cached per-file frames for the rest.
 
     Returns:
         Combined financial DataFrame with MultiIndex (Organization, Measure).
@@ -42,6 +57,22 @@ def get_financials_by_state(state: State) -> pd.DataFrame:
     """
     if state not in _STATE_DISPATCH:
         raise ValueError(f"Unsupported state: '{state}'. Supported states: {list(_STATE_DISPATCH)}")
-    return _STATE_DISPATCH[state]()
+    return _STATE_DISPATCH[state](max_workers, incremental)
+
+
+def get_source_files_by_state(state: State) -> list[str]:
+    """
+    Returns the paths of the raw input files that get_financials_by_state reads for the given state.
+
+    Args:
+        state: State enum member.
 
+    Returns:
+        List of file paths, in the order they are ingested.
 
+    Raises:
+        ValueError: If the state is not supported.
+    """
+    if state not in _SOURCE_FILES_DISPATCH:
+        raise ValueError(f"Unsupported state: '{state}'. Supported states: {list(_SOURCE_FILES_DISPATCH)}")
+    return _SOURCE_FILES_DISPATCH[state]()
@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 from a_Config.enumerations.state_enum import State
-from a_Config.global_constants import EXTERNAL_MAPPINGS
+from a_Config.global_constants import EXTERNAL_MAPPING_INCIDENCE
 
 
 def apply_external_mappings(df: pd.DataFrame, state: State) -> pd.DataFrame:
@@ -13,6 +14,10 @@ def apply_external_mappings(df: pd.DataFrame, state: State) -> pd.DataFrame:
     aggregated row is appended as the sum of the mapped external measures.
     Rows not referenced in the config are passed through unchanged.
 
+    The state's rules come precompiled as an (external x standardized) incidence
+    matrix (EXTERNAL_MAPPING_INCIDENCE), applied in a single reduction over the
+    measure axis of a dense cube holding only the mapped external rows.
+
     Args:
         df: DataFrame with MultiIndex (Org ID, Organization Name, Measure)
             and numeric year columns.
@@ -22,21 +27,27 @@ def apply_external_mappings(df: pd.DataFrame, state: State) -> pd.DataFrame:
         DataFrame with the same structure, with aggregated rows replacing
         the source external measure rows.
     """
-    state_mappings = EXTERNAL_MAPPINGS[EXTERNAL_MAPPINGS['State'] == state]
-    if state_mappings.empty:
+    state_incidence = EXTERNAL_MAPPING_INCIDENCE.get(state)
+    if state_incidence is None:
         return df
 
-    ext_to_std = state_mappings.set_index('External Measure')['Standardized Measure'].to_dict()
+    index = df.index
+    measure_level = index.names.index('Measure')
+    measure_codes = index.codes[measure_level]
+    measures = index.levels[measure_level]
+    measures_in_df = set(measures[np.unique(measure_codes[measure_codes >= 0])])
 
-    measures_in_df = set(df.index.get_level_values('Measure'))
-    relevant_ext = {k: v for k, v in ext_to_std.items() if k in measures_in_df}
-    if not relevant_ext:
+    ext_rows = [i for i, ext in enumerate(state_incidence.external_measures) if ext in measures_in_df]
+    if not ext_rows:
         return df
+    relevant_ext = [state_incidence.external_measures[i] for i in ext_rows]
+    target_cols = np.flatnonzero(state_incidence.incidence[ext_rows].any(axis=0))
+    incidence = state_incidence.incidence[np.ix_(ext_rows, target_cols)]
+    std_targets = [state_incidence.standardized_measures[j] for j in target_cols]
 
     # If an aggregation target already exists in the df but wasn't listed as
     # an external source, the concat would silently create duplicates. Fail loudly.
-    std_targets = set(relevant_ext.values())
-    implicit_conflicts = (std_targets & measures_in_df) - set(relevant_ext.keys())
+    implicit_conflicts = (set(std_targets) & measures_in_df) - set(relevant_ext)
     if implicit_conflicts:
         raise ValueError(
             f"Aggregation target(s) {sorted(implicit_conflicts)} already exist in the "
@@ -44,21 +55,42 @@ def apply_external_mappings(df: pd.DataFrame, state: State) -> pd.DataFrame:
             f"for state '{state.value}'. Add them explicitly so the intent is clear."
         )
 
-    ext_mask = df.index.get_level_values('Measure').isin(relevant_ext)
-    df_to_agg = df[ext_mask].copy()
-    df_remaining = df
+    # Lay out only the external rows as a dense (Organization, external measure, Year) cube
+    ext_pos = pd.Index(relevant_ext).get_indexer(measures)
+    row_ext = ext_pos[measure_codes]
+    ext_mask = row_ext >= 0
+    df_to_agg = df[ext_mask]
+    org_codes, orgs = pd.factorize(df_to_agg.index.get_level_values('Organization'), sort=True)
+    year_codes, years = pd.factorize(df_to_agg.index.get_level_values('Year'), sort=True)
+    cells = (org_codes, row_ext[ext_mask], year_codes)
 
-    new_measures = df_to_agg.index.get_level_values('Measure').map(relevant_ext)
-    df_to_agg.index = pd.MultiIndex.from_arrays(
-        [
-            df_to_agg.index.get_level_values('Organization'),
-            new_measures,
-            df_to_agg.index.get_level_values('Year'),
-        ],
-        names=df_to_agg.index.names,
-    )
+    shape = (len(orgs), len(relevant_ext), len(years))
+    values = np.full(shape + (len(df.columns),), np.nan)
+    exists = np.zeros(shape, dtype=bool)
+    values[cells] = df_to_agg.to_numpy(dtype=float)
+    exists[cells] = True
 
-    df_aggregated = df_to_agg.groupby(level=df_to_agg.index.names).sum(min_count=1)
+    # One reduction over the measure axis maps every external measure onto its target;
+    # a target is NaN only when none of its sources has a value (sum(min_count=1)).
+    present = ~np.isnan(values)
+    sums = np.einsum('oeyc,et->otyc', np.where(present, values, 0.0), incidence)
+    num_present = np.einsum('oeyc,et->otyc', present.astype(float), incidence)
+    has_rows = np.einsum('oey,et->oty', exists.astype(float), incidence) > 0
+    sums = np.where(num_present > 0, sums, np.nan)
+
+    target_order = np.argsort(np.array(std_targets, dtype=object))
+    org_idx, target_idx, year_idx = np.nonzero(has_rows[:, target_order, :])
+    target_idx = target_order[target_idx]
+    df_aggregated = pd.DataFrame(
+        sums[org_idx, target_idx, year_idx],
+        index=pd.MultiIndex.from_arrays(
+            [orgs[org_idx], np.array(std_targets, dtype=object)[target_idx], years[year_idx]],
+            names=df.index.names,
+        ),
+        columns=df.columns,
+    )
 
-    combined = pd.concat([df_remaining, df_aggregated])
-    return combined[~combined.index.duplicated(keep='last')]
+    # Aggregated rows replace any source row they collide with (a target that is also a source)
+    replaced = np.isin(measures, std_targets)[measure_codes] & (measure_codes >= 0)
+    df_remaining = df[~replaced] if replaced.any() else df
+    return pd.concat([df_remaining, df_aggregated])
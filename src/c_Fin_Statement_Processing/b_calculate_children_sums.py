@@ -1,57 +1,90 @@
+import numpy as np
 import pandas as pd
-from a_Config.global_constants import FINANCIAL_STATEMENT_MODEL
+from typing import NamedTuple
+from a_Config.fin_statement_model_utils import get_children_sum_operator, get_fin_statement_tree
 
 
-def calculate_children_sums(df: pd.DataFrame) -> pd.DataFrame:
+class MeasureCube(NamedTuple):
+    """Dense (Organization, Measure, Year) layout of a long-format financial DataFrame.
+
+    The measure axis follows the financial statement model order. ``exists`` marks cells
+    that have a row in the source frame, whether or not its Value is NaN.
     """
-    Calculate the sum of direct children for each parent line item.
-    
-    Joins the input dataframe with FINANCIAL_STATEMENT_MODEL to get parent relationships,
-    then groups by Organization and Parent to sum children values per fiscal year.
+    orgs: pd.Index
+    years: pd.Index
+    values: np.ndarray
+    exists: np.ndarray
 
-    Args:
-        df: DataFrame from create_combined_financial_df with MultiIndex (Organization, Measure)
-            and fiscal year columns containing values.
 
-    Returns:
-        pd.DataFrame with MultiIndex (Organization, Parent) and fiscal year columns containing
-        sums of direct children values. NaNs filled with 0.
+def to_measure_cube(df: pd.DataFrame) -> MeasureCube:
+    """
+    Scatters the 'Value' column of df onto a dense (Organization, Measure, Year) array.
+    Rows whose Measure is not in the financial statement model are ignored.
+
+    Args:
+        df: DataFrame with MultiIndex (Organization, Measure, Year) and a 'Value' column.
     """
-    # Reset index to make Organization and Measure columns
-    df_reset = df.reset_index()
-    
-    # Prepare model with Measure and Parent columns
-    model_reset = FINANCIAL_STATEMENT_MODEL.reset_index()[['Measure', 'Parent', 'Neg_Multiplier']].copy()
-    model_reset = model_reset.dropna(subset=['Parent'])
-    model_reset = model_reset[model_reset['Parent'] != '']
+    tree = get_fin_statement_tree()
+    index = df.index.remove_unused_levels()
+    orgs = index.levels[index.names.index('Organization')]
+    years = index.levels[index.names.index('Year')]
+    org_codes = index.codes[index.names.index('Organization')]
+    year_codes = index.codes[index.names.index('Year')]
+    level_nodes = index.levels[index.names.index('Measure')].map(tree.position).to_numpy(dtype=float, na_value=-1)
+    node_codes = level_nodes[index.codes[index.names.index('Measure')]]
+    in_model = (node_codes >= 0) & (org_codes >= 0) & (year_codes >= 0)
+    cells = (org_codes[in_model], node_codes[in_model].astype(np.intp), year_codes[in_model])
 
-    # Expected number of children per Parent according to the model
-    expected_children_per_parent = model_reset.groupby('Parent')['Measure'].count()
+    shape = (len(orgs), len(tree.measures), len(years))
+    values = np.full(shape, np.nan)
+    exists = np.zeros(shape, dtype=bool)
+    values[cells] = df['Value'].to_numpy(dtype=float)[in_model]
+    exists[cells] = True
+    return MeasureCube(orgs=orgs, years=years, values=values, exists=exists)
 
-    # Left join to add Parent to each row
-    df_with_parent = df_reset.merge(
-        model_reset,
-        on='Measure',
-        how='inner'  # only keep rows that have a parent in the model
-    )
 
-    # Group by Organization, Parent, and Year, sum across all children per group
-    group_cols = ['Organization', 'Parent', 'Year']
+def calculate_children_sums(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the sum of direct children for each parent line item.
 
-    df_with_parent['Value'] *= df_with_parent['Neg_Multiplier']  # Apply negation if needed
+    Lays the input out as a dense (Organization, Measure, Year) cube and applies the
+    compiled (parent x child) matrix from get_children_sum_operator, which carries each
+    child's Neg_Multiplier, so every parent, organization and year is summed in one
+    matrix product. A companion product over the non-NaN mask counts the children
+    present, and parents without every model-defined child present are NaN.
 
-    df_with_parent_group = df_with_parent.groupby(group_cols)
+    Args:
+        df: DataFrame with MultiIndex (Organization, Measure, Year) and a 'Value' column.
 
-    # Non-NaN children present in data per group
-    actual_counts = df_with_parent_group['Value'].count()
+    Returns:
+        pd.DataFrame with MultiIndex (Organization, Measure, Year), where Measure is the
+        parent, and a 'Value' column containing sums of direct children values. Only
+        (Organization, Parent, Year) groups with at least one child row in df are
+        returned, sorted by Organization, Parent and Year.
+    """
+    operator = get_children_sum_operator()
+    cube = to_measure_cube(df)
 
-    sums_df = df_with_parent_group['Value'].sum(min_count=1)
+    present = ~np.isnan(cube.values)
+    sums = operator.signed @ np.where(present, cube.values, 0.0)
+    present_children = operator.membership @ present
+    child_rows = operator.membership @ cube.exists
 
     # Where the data doesn't have all model-defined children with values, return NaN
-    expected = actual_counts.index.get_level_values('Parent').map(expected_children_per_parent)
-    all_present = actual_counts == expected
-    sums_df = sums_df.where(all_present)
+    all_present = present_children == operator.expected_children[None, :, None]
+    sums = np.where(all_present, sums, np.nan)
 
-    sums_df.index.names = ['Organization', 'Measure', 'Year']  # Rename Parent to Measure for consistency
+    # Walk the groups in (Organization, Parent, Year) label order, as groupby would
+    measures = np.array(get_fin_statement_tree().measures, dtype=object)
+    org_order, parent_order, year_order = cube.orgs.argsort(), measures.argsort(), cube.years.argsort()
+    has_group = child_rows[np.ix_(org_order, parent_order, year_order)] > 0
+    org_idx, parent_idx, year_idx = np.nonzero(has_group)
+    org_idx, parent_idx, year_idx = org_order[org_idx], parent_order[parent_idx], year_order[year_idx]
 
-    return sums_df.rename('Value').to_frame()
\ No newline at end of file
+    index = pd.MultiIndex(
+        levels=[cube.orgs, pd.Index(measures), cube.years],
+        codes=[org_idx, parent_idx, year_idx],
+        names=['Organization', 'Measure', 'Year'],
+        verify_integrity=False,
+    ).remove_unused_levels()
+    return pd.DataFrame({'Value': sums[org_idx, parent_idx, year_idx]}, index=index)
@@ -1,28 +1,64 @@
+import numpy as np
 import pandas as pd
 from a_Config.global_constants import FINANCIAL_STATEMENT_MODEL
-from .b_calculate_children_sums import calculate_children_sums
+from a_Config.fin_statement_model_utils import get_fin_statement_tree
+from .b_calculate_children_sums import to_measure_cube
 
 
 def add_imputed_sum_of_children_rows(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Computes the sum of children for each parent measure via calculate_children_sums,
-    then inserts any parent rows that are present in the computed sums but absent
-    from the input dataframe. Existing rows are left unchanged.
+    Inserts a sum-of-children row for every parent measure that is absent from the
+    input dataframe but whose model-defined children all have values, using the same
+    rule as calculate_children_sums. Existing rows are left unchanged.
 
-    Recursively repeats until no new rows can be computed, allowing multi-level
-    parent hierarchies to be fully resolved.
+    Values are laid out on a dense (Organization, Measure, Year) array and parents are
+    visited once each in reverse pre-order of the financial statement tree, so every
+    parent is filled from children that have already been resolved. This resolves
+    multi-level hierarchies in a single pass.
 
     Args:
-        df: DataFrame with MultiIndex (Organization, Measure) and numeric year columns.
+        df: DataFrame with MultiIndex (Organization, Measure, Year) and a 'Value' column.
 
     Returns:
-        DataFrame augmented with computed rows for any parent measures not already present.
+        DataFrame augmented with computed rows for any parent measures not already present,
+        appended in the order the previous level-by-level recursion produced them.
     """
-    children_sums = calculate_children_sums(df)
-    children_sums.dropna(axis=0, how='all', inplace=True)
-    new_rows = children_sums[~children_sums.index.isin(df.index)]
-    if new_rows.empty:
+    tree = get_fin_statement_tree()
+    neg_multiplier = FINANCIAL_STATEMENT_MODEL['Neg_Multiplier'].to_numpy(dtype=float)
+    cube = to_measure_cube(df)
+    orgs, years, values, exists = cube.orgs, cube.years, cube.values, cube.exists
+
+    # Level at which each cell was imputed (0 = input row), used to reproduce the row order.
+    level = np.zeros(values.shape, dtype=np.int64)
+    for parent in tree.preorder[::-1]:
+        children = list(tree.children[parent])
+        if not children:
+            continue
+        child_values = values[:, children, :]
+        fill = ~np.isnan(child_values).any(axis=1) & ~exists[:, parent, :]
+        if not fill.any():
+            continue
+        sums = (child_values * neg_multiplier[children][None, :, None]).sum(axis=1)
+        values[:, parent, :] = np.where(fill, sums, values[:, parent, :])
+        exists[:, parent, :] |= fill
+        level[:, parent, :] = np.where(fill, level[:, children, :].max(axis=1) + 1, level[:, parent, :])
+
+    org_idx, node_idx, year_idx = np.nonzero(level)
+    if len(org_idx) == 0:
         return df
-    augmented_df = pd.concat([df, new_rows])
-    return add_imputed_sum_of_children_rows(augmented_df) # TODO: somewhat inefficient because it recalcs on the whole dataframe, not just the siblings of new rows which is all that might have changed
 
+    measures = np.array(tree.measures, dtype=object)
+    org_rank, measure_rank, year_rank = (np.argsort(labels.argsort()) for labels in (orgs, measures, years))
+    order = np.lexsort((
+        year_rank[year_idx], measure_rank[node_idx], org_rank[org_idx], level[org_idx, node_idx, year_idx]
+    ))
+    org_idx, node_idx, year_idx = org_idx[order], node_idx[order], year_idx[order]
+
+    new_rows = pd.DataFrame(
+        {'Value': values[org_idx, node_idx, year_idx]},
+        index=pd.MultiIndex.from_arrays(
+            [orgs[org_idx], measures[node_idx], years[year_idx]],
+            names=['Organization', 'Measure', 'Year'],
+        ),
+    )
+    return pd.concat([df, new_rows])
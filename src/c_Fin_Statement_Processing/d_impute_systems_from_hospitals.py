@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 from a_Config.enumerations.state_enum import State
+from a_Config.fin_statement_model_utils import get_fin_statement_tree
 from a_Config.global_constants import HOSPITAL_METADATA, SYSTEMS_TO_HOSPITALS_MAP, LINE_ITEMS
+from .b_calculate_children_sums import to_measure_cube
 
 # TODO: this currently just calculates the dollar value. I haven't exaustively tested whether that or
 # extending back with changes makes more sense though doens't seem problematic when spot checking.
@@ -11,10 +14,15 @@ def impute_systems_from_hospitals(df: pd.DataFrame, state: State) -> pd.DataFram
     For each health system in SYSTEMS_TO_HOSPITALS_MAP for this state, sums
     LINE_ITEMS measures across all member hospitals per measure/year.  A system
     is only included when every one of its member hospitals is present in the
-    DataFrame as an organization.  For a given measure/year, if any member
-    hospital has a missing value the aggregate is NaN.  Existing rows in the
+    DataFrame as an organization (Non-Affiliated sums whichever of its hospitals
+    are present).  For a given measure/year, missing member values are skipped
+    and the aggregate is NaN only if no member has a value.  Existing rows in the
     DataFrame take precedence over computed system rows.
 
+    All systems are computed at once: the eligible systems form a
+    (system x organization) membership matrix that is contracted against the
+    dense (organization, measure, year) value cube.
+
     Args:
         df: DataFrame with MultiIndex (Organization, Measure, Year) and a
             'Value' column.  Expected to be the output of add_computed_parent_rows
@@ -26,16 +34,13 @@ def impute_systems_from_hospitals(df: pd.DataFrame, state: State) -> pd.DataFram
         DataFrame augmented with system-level rows for any (system, measure, year)
         not already present.
     """
-    hospital_orgs = set(HOSPITAL_METADATA.index.get_level_values('Organization'))
-    hospitals_in_df = set(df.index.get_level_values('Organization')) & hospital_orgs
-
-    mask = (
-        df.index.get_level_values('Organization').isin(hospitals_in_df)
-        & df.index.get_level_values('Measure').isin(LINE_ITEMS)
-    )
-    df_hospitals = df[mask]
+    tree = get_fin_statement_tree()
+    cube = to_measure_cube(df)
+    org_pos = {org: i for i, org in enumerate(cube.orgs)}
+    hospitals_in_df = set(cube.orgs[cube.orgs.isin(HOSPITAL_METADATA.index.get_level_values('Organization'))])
 
-    system_rows = []
+    # (system x organization) membership matrix for the systems that can be imputed
+    systems, membership_rows = [], []
     for (system, sys_state), hospitals in SYSTEMS_TO_HOSPITALS_MAP.items():
         if sys_state != state:
             continue
@@ -47,22 +52,35 @@ def impute_systems_from_hospitals(df: pd.DataFrame, state: State) -> pd.DataFram
         if is_non_affiliated and not present_hospitals:
             continue
 
-        df_members = df_hospitals[
-            df_hospitals.index.get_level_values('Organization').isin(
-                present_hospitals if is_non_affiliated else hospitals
-            )
-        ]
+        row = np.zeros(len(cube.orgs))
+        row[[org_pos[h] for h in present_hospitals]] = 1.0
+        systems.append(system)
+        membership_rows.append(row)
 
-        grouped = df_members.groupby(level=['Measure', 'Year'])
-        sums = grouped['Value'].sum(min_count=1)
+    if not systems:
+        return df
 
-        new_rows = sums.rename('Value').reset_index()
-        new_rows['Organization'] = system
-        new_rows = new_rows.set_index(['Organization', 'Measure', 'Year'])[['Value']]
-        system_rows.append(new_rows)
+    membership = np.vstack(membership_rows)
+    line_items = np.flatnonzero(np.isin(np.array(tree.measures, dtype=object), LINE_ITEMS))
+    values = cube.values[:, line_items, :]
+    present = ~np.isnan(values)
 
-    if not system_rows:
-        return df
+    # Sum over member hospitals with missing values skipped; NaN only if no member has a value
+    sums = np.tensordot(membership, np.where(present, values, 0.0), axes=(1, 0))
+    num_present = np.tensordot(membership, present, axes=(1, 0))
+    has_rows = np.tensordot(membership, cube.exists[:, line_items, :], axes=(1, 0)) > 0
+    sums = np.where(num_present > 0, sums, np.nan)
 
-    all_system_rows = pd.concat(system_rows)
+    system_idx, measure_idx, year_idx = np.nonzero(has_rows)
+    all_system_rows = pd.DataFrame(
+        {'Value': sums[system_idx, measure_idx, year_idx]},
+        index=pd.MultiIndex.from_arrays(
+            [
+                np.array(systems, dtype=object)[system_idx],
+                np.array(tree.measures, dtype=object)[line_items][measure_idx],
+                cube.years[year_idx],
+            ],
+            names=['Organization', 'Measure', 'Year'],
+        ),
+    )
     return df.combine_first(all_system_rows)
@@ -1,12 +1,21 @@
+import numpy as np
 import pandas as pd
 import xarray as xr
-import streamlit as st
+from typing import NamedTuple
+from a_Config.coordinate_codes import decode_dataset, encode_labels
 from a_Config.enumerations.state_enum import State
 from a_Config.global_constants import VALID_MEASURES, HOSPITAL_METADATA
+from b_Ingest.ingest_workers import map_per_file
 from b_Ingest.z_get_financials_by_state import get_financials_by_state
 from c_Fin_Statement_Processing.a_external_to_internal_mapping import apply_external_mappings
 from c_Fin_Statement_Processing.c_add_imputed_sum_of_children_rows import add_imputed_sum_of_children_rows
 from c_Fin_Statement_Processing.d_impute_systems_from_hospitals import impute_systems_from_hospitals
+from c_Fin_Statement_Processing.f_processed_state_cache import (
+    get_state_cache_key,
+    read_cached_state_df,
+    write_cached_state_df,
+)
+from c_Fin_Statement_Processing.g_pipeline_cache import cached_stage, fingerprint
 
 
 def drop_non_model_measures(df: pd.DataFrame) -> pd.DataFrame:
@@ -22,7 +31,7 @@ def process_state_input_df(state: State, input_df=None) -> pd.DataFrame:
         DataFrame with MultiIndex (Organization, State, Measure, Year)
         and columns Value, Year Failed.
     """
-    if not input_df:
+    if input_df is None:
         input_df = get_financials_by_state(state)
 
     df = apply_external_mappings(input_df, state)
@@ -57,20 +66,151 @@ def process_state_input_df(state: State, input_df=None) -> pd.DataFrame:
     return internal_domain_df
 
 
-@st.cache_data
-def _load_all_states(states: tuple) -> xr.Dataset:
-    df = pd.concat([process_state_input_df(s) for s in states])
-    df = df.rename_axis(
-        index={'Organization': 'organization', 'State': 'state',
-               'Measure': 'measure', 'Year': 'year'}
+def load_processed_state_df(state: State, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Returns process_state_input_df(state), served from the on-disk processed cache
+    when the state's input files and csv_configs are unchanged since it was written.
+    On a miss, ingest is incremental so only new or changed source files are re-parsed.
+    """
+    if not use_cache:
+        return process_state_input_df(state)
+
+    key = get_state_cache_key(state)
+    df = read_cached_state_df(state, key)
+    if df is None:
+        df = process_state_input_df(state, get_financials_by_state(state, incremental=True))
+        write_cached_state_df(df, state, key)
+    return df
+
+
+class StateArrays(NamedTuple):
+    """Compact, code-based form of one processed state, cheap to send between processes."""
+    state: int
+    organization: np.ndarray
+    measure: np.ndarray
+    year: np.ndarray
+    value: np.ndarray
+    failed_organization: np.ndarray
+    year_failed: np.ndarray
+
+
+def build_state_arrays(state: State) -> StateArrays:
+    """
+    Loads one processed state (see load_processed_state_df) and reduces it to
+    coordinate codes plus a value array, with Year Failed collapsed to one entry
+    per organization.
+    """
+    df = load_processed_state_df(state)
+    index = df.index
+    year_failed = df['Year Failed'].groupby(level='Organization').first()
+    return StateArrays(
+        state=int(encode_labels('state', [state])[0]),
+        organization=encode_labels('organization', index.get_level_values('Organization')),
+        measure=encode_labels('measure', index.get_level_values('Measure')),
+        year=index.get_level_values('Year').to_numpy(dtype=np.int64),
+        value=df['Value'].to_numpy(dtype=float),
+        failed_organization=encode_labels('organization', year_failed.index),
+        year_failed=year_failed.to_numpy(dtype=object),
     )
-    value_da = df['Value'].to_xarray().sortby('year')
-    year_failed_da = (
-        df['Year Failed']
-        .groupby(level=['organization', 'state']).first()
-        .to_xarray()
+
+
+def assemble_state_cube(parts: list[StateArrays], collapse_entities: bool = False) -> xr.Dataset:
+    """
+    Scatters per-state arrays straight into a preallocated dense cube.
+
+    Each coordinate is the sorted set of codes seen across all parts, and every row's
+    position on it comes from the inverse indices of np.unique, so no MultiIndex or
+    cartesian reindex is built. Cells without a row are NaN.
+
+    Args:
+        parts: One StateArrays per state.
+        collapse_entities: If True, replace the organization and state dimensions with a
+            single entity dimension holding only the (organization, state) pairs that have
+            data, with organization, state and year_failed as coordinates along it. Since
+            a hospital reports in one state, this avoids allocating a block for every
+            state it does not belong to.
+
+    Returns:
+        Dataset with a 'value' variable over (organization, state, measure, year), or
+        (entity, measure, year) when collapse_entities is True, and a year_failed coordinate.
+    """
+    organization = np.concatenate([p.organization for p in parts])
+    state = np.concatenate([np.full(len(p.value), p.state, dtype=np.int32) for p in parts])
+    measure = np.concatenate([p.measure for p in parts])
+    year = np.concatenate([p.year for p in parts])
+    value = np.concatenate([p.value for p in parts])
+    failed_organization = np.concatenate([p.failed_organization for p in parts])
+    failed_state = np.concatenate([np.full(len(p.year_failed), p.state, dtype=np.int32) for p in parts])
+    year_failed = np.concatenate([p.year_failed for p in parts])
+
+    measures, measure_idx = np.unique(measure, return_inverse=True)
+    years, year_idx = np.unique(year, return_inverse=True)
+
+    if collapse_entities:
+        # Pack (organization, state) into one sortable key per entity
+        entity_keys, entity_idx = np.unique(
+            organization.astype(np.int64) << 32 | state.astype(np.int64), return_inverse=True
+        )
+        values = np.full((len(entity_keys), len(measures), len(years)), np.nan)
+        values[entity_idx, measure_idx, year_idx] = value
+        entity_year_failed = np.full(len(entity_keys), np.nan, dtype=object)
+        failed_keys = failed_organization.astype(np.int64) << 32 | failed_state.astype(np.int64)
+        entity_year_failed[np.searchsorted(entity_keys, failed_keys)] = year_failed
+        return xr.Dataset(
+            {'value': (('entity', 'measure', 'year'), values)},
+            coords={
+                'organization': ('entity', (entity_keys >> 32).astype(np.int32)),
+                'state': ('entity', (entity_keys & 0xFFFFFFFF).astype(np.int32)),
+                'year_failed': ('entity', entity_year_failed),
+                'measure': measures,
+                'year': years,
+            },
+        )
+
+    organizations, organization_idx = np.unique(organization, return_inverse=True)
+    states, state_idx = np.unique(state, return_inverse=True)
+    values = np.full((len(organizations), len(states), len(measures), len(years)), np.nan)
+    values[organization_idx, state_idx, measure_idx, year_idx] = value
+    org_year_failed = np.full((len(organizations), len(states)), np.nan, dtype=object)
+    org_year_failed[
+        np.searchsorted(organizations, failed_organization), np.searchsorted(states, failed_state)
+    ] = year_failed
+    return xr.Dataset(
+        {'value': (('organization', 'state', 'measure', 'year'), values)},
+        coords={
+            'organization': organizations,
+            'state': states,
+            'measure': measures,
+            'year': years,
+            'year_failed': (('organization', 'state'), org_year_failed),
+        },
     )
-    return xr.Dataset({'value': value_da}, coords={'year_failed': year_failed_da})
+
+
+def states_data_fingerprint(states, **_) -> str:
+    """Fingerprint of the raw input files and csv_configs behind the given states."""
+    return fingerprint(*(get_state_cache_key(state) for state in states))
+
+
+@cached_stage(data_fingerprint=states_data_fingerprint, ignore=('max_workers',))
+def _load_all_states(states: tuple, max_workers: int | None = None, collapse_entities: bool = False) -> xr.Dataset:
+    """
+    Builds the core cube for the given states. The organization, state and measure
+    coordinates hold integer codes from a_Config.coordinate_codes rather than labels;
+    load_pre_transformed_dataset decodes them on the way out.
+
+    States are independent until the cube is assembled, so with max_workers set each
+    state is processed in its own worker process and only its StateArrays come back.
+    Results are memoized in the pipeline cache, keyed on the states, the layout and
+    the content of every input file, so editing a source file or config rebuilds.
+
+    Args:
+        states: States to include.
+        max_workers: Process pool size. None or 1 builds the states sequentially.
+        collapse_entities: Build the (entity, measure, year) layout; see assemble_state_cube.
+    """
+    parts = map_per_file(build_state_arrays, states, max_workers=max_workers, use_processes=True)
+    return assemble_state_cube(parts, collapse_entities=collapse_entities)
 
 
 def load_pre_transformed_dataset(
@@ -79,12 +219,13 @@ def load_pre_transformed_dataset(
     entities=None,
     year_start=None,
     year_end=None,
+    max_workers: int | None = None,
 ) -> xr.Dataset:
-    ds = _load_all_states(tuple(states))
+    ds = _load_all_states(tuple(states), max_workers=max_workers)
 
     if entities is not None:
-        ds = ds.sel(organization=list(entities))
+        ds = ds.sel(organization=encode_labels('organization', entities))
     if year_start is not None and year_end is not None:
         ds = ds.sel(year=slice(str(year_start), str(year_end)))
 
-    return ds
+    return decode_dataset(ds)
@@ -0,0 +1,79 @@
+"""
+Persistent on-disk cache of per-state processed DataFrames.
+
+Entries are Parquet files keyed by a content hash of the state's raw input files,
+every csv_configs/*.csv and the source of the processing code, so a warm start
+skips ingest entirely, editing a data file only invalidates the state that reads
+it, and editing the processing code invalidates every state.
+"""
+import glob
+import hashlib
+import os
+import pandas as pd
+from a_Config.cache_io import atomic_write, hash_files, source_fingerprint
+from a_Config.enumerations.hospital_enum import to_entity
+from a_Config.enumerations.state_enum import State
+from b_Ingest.ingest_file_cache import get_config_files
+from b_Ingest.z_get_financials_by_state import get_source_files_by_state
+
+PROCESSED_CACHE_DIR = os.path.join("src", "z_Data", "Processed_Cache")
+
+# Module whose import closure produces the processed frame (process_state_input_df),
+# including this cache's own read/write layout
+_PROCESSING_MODULE = 'c_Fin_Statement_Processing.e_main_data_pipeline'
+
+_INDEX_NAMES = ['Organization', 'State', 'Measure', 'Year']
+
+
+def get_state_cache_key(state: State) -> str:
+    """
+    Returns the content hash identifying the processed frame for a state: the
+    state's raw input files, every csv_configs/*.csv and the source of the modules
+    that process them (see source_fingerprint).
+    """
+    files_hash = hash_files(get_source_files_by_state(state) + get_config_files())
+    return hashlib.sha256(f"{source_fingerprint(_PROCESSING_MODULE)}:{files_hash}".encode()).hexdigest()
+
+
+def _cache_path(state: State, key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{state.value}_{key[:16]}.parquet")
+
+
+def read_cached_state_df(state: State, key: str, cache_dir: str = PROCESSED_CACHE_DIR) -> pd.DataFrame | None:
+    """
+    Reads a processed state DataFrame from the cache, restoring the enum-typed
+    Organization and State index levels.
+
+    Returns:
+        DataFrame with MultiIndex (Organization, State, Measure, Year) and columns
+        Value, Year Failed, or None if there is no entry for key.
+    """
+    path = _cache_path(state, key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    df = pd.read_parquet(path).set_index(_INDEX_NAMES)
+    df.index = (
+        df.index
+        .set_levels(df.index.levels[0].map(to_entity), level='Organization')
+        .set_levels(df.index.levels[1].map(State), level='State')
+    )
+    df['Year Failed'] = df['Year Failed'].astype(object).where(df['Year Failed'].notna(), None)
+    return df
+
+
+def write_cached_state_df(df: pd.DataFrame, state: State, key: str, cache_dir: str = PROCESSED_CACHE_DIR) -> None:
+    """
+    Writes a processed state DataFrame to the cache and removes stale entries
+    for the same state.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(state, key, cache_dir)
+    for stale in glob.glob(os.path.join(cache_dir, f"{state.value}_*.parquet")):
+        if stale != path:
+            os.remove(stale)
+
+    out = df.reset_index()
+    out['Organization'] = out['Organization'].astype(str)
+    out['State'] = out['State'].astype(str)
+    atomic_write(path, lambda tmp_path: out.to_parquet(tmp_path, index=False))
@@ -0,0 +1,253 @@
+"""
+Framework-neutral memoization for pipeline stages.
+
+Stages decorated with cached_stage are keyed on a fingerprint of their arguments,
+the source of the stage's module and the modules it imports, and optionally a
+fingerprint of the data they read (for example the source file and csv_configs
+hashes behind get_state_cache_key), so notebooks, batch jobs and apps share one
+cache and a changed input or edited stage can never be served a stale result.
+Results are kept in memory and pickled to PIPELINE_CACHE_DIR, so a restarted app
+or a second process starts warm. Apps add their own UI-level caching on top
+(e.g. st.cache_data) as a thin adapter and shrink the memory budget to match.
+
+As with st.cache_data, every caller gets its own copy of a cached value, so
+mutating a result never leaks into later hits.
+"""
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from a_Config.cache_io import atomic_write, source_fingerprint
+
+PIPELINE_CACHE_DIR = os.path.join("src", "z_Data", "Processed_Cache", "pipeline")
+
+_MISSING = object()
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate in-memory size of a cached value, recursing into tuples, lists and dicts."""
+    if isinstance(value, (xr.Dataset, xr.DataArray)):
+        return int(value.nbytes)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, (pd.Index, np.ndarray)):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    return 0
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce a stage argument to a plain, order-stable structure for hashing."""
+    if isinstance(value, Enum):
+        return (type(value).__name__, value.value)
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted((_canonical(v) for v in value), key=repr)))
+    if isinstance(value, (tuple, list, range)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, (np.ndarray, pd.Index, pd.Series)):
+        return tuple(_canonical(v) for v in value.tolist())
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((repr(_canonical(k)), _canonical(v)) for k, v in value.items())))
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    raise TypeError(f"Cannot fingerprint argument of type {type(value).__name__}.")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a sha256 hex digest identifying parts (strings, numbers, enums and containers of them)."""
+    return hashlib.sha256(repr(_canonical(parts)).encode()).hexdigest()
+
+
+class PipelineCache:
+    """
+    In-memory LRU cache bounded by the estimated size of its values, with an optional
+    on-disk pickle tier that survives restarts and is shared between processes.
+
+    Args:
+        max_bytes: Memory budget. Least recently used entries are evicted until the
+            total estimated size fits; a single value larger than the budget is not
+            held in memory at all. See resize.
+        disk_dir: Directory for the disk tier, or None to keep the cache in memory only.
+        max_disk_bytes: Disk budget. After each write the least recently used files
+            (by modification time, which a disk hit refreshes) are removed until the
+            tier fits.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 1024 ** 3,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 4 * 1024 ** 3,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored under key, promoting a disk hit into memory."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        if self.disk_dir is None or not os.path.exists(self._disk_path(key)):
+            return default
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                value = pickle.load(f)
+            os.utime(self._disk_path(key))
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return default
+        self._put_memory(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key in memory and, if configured, on disk."""
+        self._put_memory(key, value)
+        if self.disk_dir is not None:
+            def write(tmp_path: str) -> None:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            atomic_write(self._disk_path(key), write)
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def resize(self, max_bytes: int) -> None:
+        """Set the memory budget, evicting least recently used entries until it fits."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict_to_budget()
+
+    def _evict_to_budget(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_bytes
+
+    def _put_memory(self, key: str, value: Any) -> None:
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._total_bytes += nbytes
+            self._evict_to_budget()
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop every in-memory entry, and the disk tier too if disk is True."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        if disk and self.disk_dir is not None and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated size of the values currently held in memory."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+PIPELINE_CACHE = PipelineCache(disk_dir=PIPELINE_CACHE_DIR)
+
+
+def cached_stage(
+    data_fingerprint: Optional[Callable[..., str]] = None,
+    ignore: Iterable[str] = (),
+    cache: Optional[PipelineCache] = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Memoize a pipeline stage in a PipelineCache.
+
+    The key combines the stage's qualified name, the source fingerprint of its module
+    (so editing the stage or anything it imports invalidates its entries), its bound
+    arguments (with defaults applied, so positional and keyword calls share entries)
+    and data_fingerprint.
+    As with st.cache_data, arguments whose name starts with an underscore are not
+    hashed, and neither are those listed in ignore, and callers receive a deep copy
+    of the cached value. A call with an argument that cannot be fingerprinted (see
+    fingerprint) bypasses the cache and runs the stage directly.
+
+    Args:
+        data_fingerprint: Called with the bound arguments as keywords; returns a string
+            that changes whenever the data the stage reads changes.
+        ignore: Argument names that do not affect the result (e.g. worker counts).
+        cache: Cache to use. Defaults to the shared PIPELINE_CACHE, looked up at call
+            time so it can be reconfigured after import.
+    """
+    ignore = frozenset(ignore)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        stage_name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            hashed = {
+                name: value for name, value in bound.arguments.items()
+                if not name.startswith('_') and name not in ignore
+            }
+            try:
+                key = fingerprint(source_fingerprint(func.__module__), stage_name, hashed)
+            except TypeError:
+                return func(*args, **kwargs)
+            if data_fingerprint is not None:
+                key = fingerprint(key, data_fingerprint(**bound.arguments))
+
+            stage_cache = cache if cache is not None else PIPELINE_CACHE
+            value = stage_cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                stage_cache.put(key, value)
+            return copy.deepcopy(value)
+
+        return wrapper
+
+    return decorator
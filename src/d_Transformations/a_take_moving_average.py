@@ -1,10 +1,70 @@
 import numpy as np
 import xarray as xr
+from typing import Sequence
 
 from a_Config.enumerations.change_type_enum import ChangeType
 
 
-def take_moving_average(da: xr.DataArray, num_years: int, changeType: ChangeType = ChangeType.ARITHMETIC) -> xr.DataArray:
+def moving_means(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Trailing means over the last axis of values for every window in windows.
+
+    One cumulative sum of the finite values (plus cumulative counts of NaN, +inf
+    and -inf) is taken, and each window is a difference of two shifted prefixes, so
+    the cost does not grow with the window size. A window is NaN unless all of its
+    observations are non-NaN, and infinities propagate as they would in a direct sum.
+
+    Because each window is a difference of running totals, results can differ from a
+    direct rolling sum in the last bits (about 1 ulp), and window 1 is not guaranteed
+    to reproduce values bit for bit.
+
+    Returns:
+        Array of shape (*values.shape, len(windows)).
+    """
+    n = values.shape[-1]
+    prefix_shape = values.shape[:-1] + (n + 1,)
+    # Running counts never exceed n, so the smallest unsigned type that holds n will do
+    count_dtype = np.min_scalar_type(n)
+
+    def prefix(a: np.ndarray, dtype) -> np.ndarray:
+        # Cumulative sum along year with a leading zero, written straight into the result
+        out = np.zeros(prefix_shape, dtype=dtype)
+        np.cumsum(a, axis=-1, dtype=dtype, out=out[..., 1:])
+        return out
+
+    finite = np.isfinite(values)
+    total = np.zeros(prefix_shape)
+    np.copyto(total[..., 1:], values, where=finite)
+    np.cumsum(total[..., 1:], axis=-1, out=total[..., 1:])
+    missing = prefix(np.isnan(values), count_dtype)
+    has_inf = not finite.all() and bool(np.isinf(values).any())
+    del finite
+    if has_inf:
+        pos_inf = prefix(np.isposinf(values), count_dtype)
+        neg_inf = prefix(np.isneginf(values), count_dtype)
+
+    out = np.full(values.shape + (len(windows),), np.nan)
+    for i, w in enumerate(windows):
+        if w > n:
+            continue
+        # Each window is written straight into its slice of the output
+        window_mean = out[..., w - 1:, i]
+        np.subtract(total[..., w:], total[..., :-w], out=window_mean)
+        if has_inf:
+            window_pos = (pos_inf[..., w:] - pos_inf[..., :-w]) > 0
+            window_neg = (neg_inf[..., w:] - neg_inf[..., :-w]) > 0
+            window_mean[window_pos] = np.inf
+            window_mean[window_neg] = np.where(window_pos[window_neg], np.nan, -np.inf)
+        window_mean /= w
+        window_mean[np.not_equal(missing[..., w:], missing[..., :-w])] = np.nan
+    return out
+
+
+def take_moving_average(
+    da: xr.DataArray,
+    num_years: int | Sequence[int],
+    changeType: ChangeType = ChangeType.ARITHMETIC,
+) -> xr.DataArray:
     """
     Computes a rolling moving average over the year dimension.
 
@@ -15,19 +75,33 @@ def take_moving_average(da: xr.DataArray, num_years: int, changeType: ChangeType
     If changeType is geometric, it will take the geometric mean over n periods as:
         exp(mean(ln(1 + r))) - 1
 
+    Passing a sequence of window sizes computes all of them from a single cumulative
+    sum over the year dimension and stacks them along a new trailing 'window'
+    dimension, so callers can switch windows with .sel(window=n) instead of rerunning.
+
     Args:
         da: DataArray with a 'year' dimension.
-        num_years: Window size for the rolling average.
+        num_years: Window size for the rolling average, or a sequence of window sizes.
 
     Returns:
         DataArray of same shape where each year contains the moving average
         ending on that year, or NaN if fewer than num_years observations exist.
+        When num_years is a sequence, the result has an extra 'window' dimension.
     """
-    if num_years > da.sizes['year']:
-        return xr.full_like(da, fill_value=np.nan)
-    
-    if changeType == ChangeType.ARITHMETIC:
-        return da.rolling(year=num_years, min_periods=num_years).mean()
-    else:
-        log_da = np.log(1 + da)
-        return np.exp(log_da.rolling(year=num_years, min_periods=num_years).mean()) - 1
\ No newline at end of file
+    windows = [num_years] if isinstance(num_years, (int, np.integer)) else list(num_years)
+
+    log_da = da if changeType == ChangeType.ARITHMETIC else np.log(1 + da)
+    year_axis = log_da.get_axis_num('year')
+    means = np.moveaxis(moving_means(np.moveaxis(log_da.values, year_axis, -1), windows), -2, year_axis)
+    if changeType != ChangeType.ARITHMETIC:
+        means = np.exp(means) - 1
+
+    ma = xr.DataArray(
+        means,
+        dims=log_da.dims + ('window',),
+        coords={**log_da.coords, 'window': windows},
+        name=da.name,
+    )
+    if isinstance(num_years, (int, np.integer)):
+        return ma.isel(window=0, drop=True)
+    return ma
@@ -1,48 +1,110 @@
+import numpy as np
 import xarray as xr
-from functools import reduce
-from a_Config.global_constants import DERIVE_RATIOS
+from typing import Iterable, Optional
+from a_Config.global_constants import DERIVE_RATIOS_OPERATOR
 
 
-def derive_ratios(da: xr.DataArray) -> xr.DataArray:
+def _ratio_rows(ratios: Iterable[str]) -> np.ndarray:
+    index = {r: i for i, r in enumerate(DERIVE_RATIOS_OPERATOR.ratios)}
+    rows = []
+    for ratio in ratios:
+        if ratio not in index:
+            raise ValueError(f"'{ratio}' is not a derived ratio in derive_ratios.csv.")
+        rows.append(index[ratio])
+    return np.array(rows, dtype=np.intp)
+
+
+def _used_sub_measures(rows: np.ndarray) -> np.ndarray:
+    operator = DERIVE_RATIOS_OPERATOR
+    return (
+        (operator.numerator[rows] != 0) | (operator.denominator[rows] != 0) | operator.required[rows]
+    ).any(axis=0)
+
+
+def _signed_sum(coefficients: np.ndarray, values: np.ndarray, finite_sum: np.ndarray) -> np.ndarray:
+    """Overlay the infinite terms of coefficients @ values onto its finite part, as a direct sum would."""
+    pos_inf, neg_inf = np.isposinf(values), np.isneginf(values)
+    positive, negative = (coefficients > 0).astype(float), (coefficients < 0).astype(float)
+    plus = positive @ pos_inf + negative @ neg_inf
+    minus = positive @ neg_inf + negative @ pos_inf
+    return np.where(plus > 0, np.where(minus > 0, np.nan, np.inf), np.where(minus > 0, -np.inf, finite_sum))
+
+
+def _derive_ratio_values(values: np.ndarray, numerator: np.ndarray, denominator: np.ndarray, required: np.ndarray) -> np.ndarray:
+    """
+    Ratios for a (sub-measure x cells) array: one contraction per side over the zero-filled
+    values, one division, and NaN wherever a required term is NaN.
+    """
+    finite = np.isfinite(values)
+    filled = np.where(finite, values, 0.0)
+    num, den = numerator @ filled, denominator @ filled
+    if not finite.all():
+        if np.isinf(values).any():
+            num = _signed_sum(numerator, values, num)
+            den = _signed_sum(denominator, values, den)
+        num = np.where(required.astype(float) @ np.isnan(values) > 0, np.nan, num)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return num / den
+
+
+def derive_ratios(da: xr.DataArray | xr.Dataset, ratios: Optional[Iterable[str]] = None) -> xr.DataArray | xr.Dataset:
     """
     Computes derived financial ratio measures and returns a DataArray
     containing only the derived ratios.
 
+    derive_ratios.csv is compiled once into (ratio x sub-measure) numerator and
+    denominator coefficient matrices (see DERIVE_RATIOS_OPERATOR), so every ratio
+    comes from one contraction per side over the measure axis plus one division.
+    A ratio is derived only if all of its non-optional sub-measures are present.
+
     NaN propagates naturally through arithmetic: if any non-optional component is NaN
-    for a given (organization, state, year), the ratio is NaN.
+    for a given (organization, state, year), the ratio is NaN. Optional components
+    count as 0 when NaN or absent.
 
     Args:
-        da: DataArray with dims (organization, state, measure, year).
+        da: DataArray with dims (organization, state, measure, year), plus any
+            others (e.g. window). A Dataset derives ratios for each data variable.
+        ratios: Ratio names to derive, in output order. Only their sub-measures
+            are read from da. Defaults to every ratio, in sorted name order.
 
     Returns:
         DataArray with the same dims except the measure dimension contains
-        only the derived ratio names.
+        only the derived ratio names, moved to the front.
+
+    Raises:
+        ValueError: If a requested name is not a ratio in derive_ratios.csv.
     """
-    available = set(da.coords['measure'].values)
-    ratio_slices = []
-
-    for ratio_name, group in DERIVE_RATIOS.groupby('Measure'):
-        required = group[~group['Optional?']]['Sub-Measure']
-        if not all(m in available for m in required):
-            continue
-
-        num_group = group[group['Numerator or Denominator'] == 'Numerator']
-        den_group = group[group['Numerator or Denominator'] == 'Denominator']
-
-        def component_sum(sub_group):
-            terms = []
-            for _, row in sub_group.iterrows():
-                if row['Optional?'] and row['Sub-Measure'] not in available:
-                    continue
-                term = da.sel(measure=row['Sub-Measure']) * row['Multiplier']
-                if row['Optional?']:
-                    term = term.fillna(0)
-                terms.append(term)
-            return reduce(lambda a, b: a + b, terms)
-
-        ratio = component_sum(num_group) / component_sum(den_group)
-        ratio_slices.append(ratio.expand_dims(measure=[ratio_name]))
-
-    if not ratio_slices:
+    if isinstance(da, xr.Dataset):
+        # Materialize once so an iterator is not consumed by the first variable
+        ratios = None if ratios is None else list(ratios)
+        return da.map(derive_ratios, ratios=ratios)
+
+    operator = DERIVE_RATIOS_OPERATOR
+    rows = np.arange(len(operator.ratios)) if ratios is None else _ratio_rows(ratios)
+    position = {m: i for i, m in enumerate(da.coords['measure'].values)}
+    present = np.array([m in position for m in operator.sub_measures])
+    rows = rows[~(operator.required[rows] & ~present[None, :]).any(axis=1)]
+    if len(rows) == 0:
         return da.isel(measure=[]).rename({'measure': 'measure'})
-    return xr.concat(ratio_slices, dim='measure')
+
+    # Gather only the measures the requested ratios read
+    columns = np.flatnonzero(present & _used_sub_measures(rows))
+    other_dims = [d for d in da.dims if d != 'measure']
+    values = da.isel(measure=[position[operator.sub_measures[c]] for c in columns]).transpose('measure', *other_dims).values
+
+    ratio_values = _derive_ratio_values(
+        values.reshape(len(columns), -1),
+        operator.numerator[np.ix_(rows, columns)],
+        operator.denominator[np.ix_(rows, columns)],
+        operator.required[np.ix_(rows, columns)],
+    )
+    return xr.DataArray(
+        ratio_values.reshape((len(rows),) + values.shape[1:]),
+        dims=('measure', *other_dims),
+        coords={
+            **{name: coord for name, coord in da.coords.items() if 'measure' not in coord.dims},
+            'measure': [operator.ratios[r] for r in rows],
+        },
+        name=da.name,
+    )
+
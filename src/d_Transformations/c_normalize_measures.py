@@ -1,24 +1,52 @@
+import numpy as np
 import xarray as xr
+from typing import Sequence
 
 
-def normalize_measures(ds: xr.Dataset, measure_name: str, vars: list = None) -> xr.Dataset:
+def normalize_measures(
+    ds: xr.Dataset,
+    measure_name: str | Sequence[str],
+    vars: list = None,
+    dtype: np.dtype | str | None = None,
+) -> xr.Dataset:
     """
     Divides data variables in ds by the corresponding value of measure_name,
     aligned on (organization, state, year). Each variable is normalized by itself
     (e.g. 'ma' is divided by the 'ma' value of measure_name, 'value' by its 'value').
 
+    Passing a list of measures normalizes by all of them in one broadcast division,
+    stacking the results along a trailing 'normalizer' dimension, so switching
+    normalizers afterwards is a .sel(normalizer=...) rather than another division.
+
     Args:
         ds: xarray Dataset with dims (organization, state, measure, year).
-        measure_name: The measure to normalize by. Must be present in ds.
+        measure_name: The measure to normalize by, or a list of them. Must be present in ds.
         vars: Data variables to normalize. Defaults to all variables in ds.
+        dtype: Output dtype of the normalized variables (e.g. np.float32 to halve
+            memory). Defaults to the input dtype.
 
     Returns:
         Dataset with the same structure, each variable divided by the selected measure.
         The normalizing measure itself is retained (will be all 1.0s).
-        Returns an empty Dataset if measure_name is not found.
+        Returns an empty Dataset if measure_name is not found, or for a list, if none
+        of its measures are found (missing ones are dropped from 'normalizer').
     """
-    if measure_name not in ds.coords['measure'].values:
-        return xr.Dataset()
+    available = ds.coords['measure'].values
+    if isinstance(measure_name, str):
+        if measure_name not in available:
+            return xr.Dataset()
+    else:
+        measure_name = [m for m in measure_name if m in available]
+        if not measure_name:
+            return xr.Dataset()
+
+    def normalize(da: xr.DataArray) -> xr.DataArray:
+        if dtype is not None:
+            da = da.astype(dtype)
+        normalizer = da.sel(measure=measure_name)
+        if not isinstance(measure_name, str):
+            normalizer = normalizer.rename({'measure': 'normalizer'})
+        return da / normalizer
 
     target_vars = vars if vars else list(ds.data_vars)
-    return ds.assign({var: ds[var] / ds[var].sel(measure=measure_name) for var in target_vars})
+    return ds.assign({var: normalize(ds[var]) for var in target_vars})
@@ -1,8 +1,10 @@
 import numpy as np
 import xarray as xr
+from typing import Sequence
+from d_Transformations.a_take_moving_average import take_moving_average
 
 
-def calc_pct_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
+def calc_pct_changes(ds: xr.Dataset, var: str, ma_years: int | Sequence[int]) -> xr.Dataset:
     """
     Computes period-over-period changes for a single variable.
 
@@ -17,7 +19,8 @@ def calc_pct_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
     Args:
         ds:       Dataset with a 'year' dimension containing var.
         var:      Name of the data variable to process.
-        ma_years: Window size for the moving average of ln_pct_change.
+        ma_years: Window size for the moving average of ln_pct_change, or a sequence of
+                  sizes to stack ma_pct_change along a 'window' dimension.
 
     Returns:
         Dataset with the six variables above.
@@ -26,10 +29,7 @@ def calc_pct_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
     ln_value = np.log(da)
     ln_pct_change = ln_value - ln_value.shift(year=1)
 
-    if ma_years > ln_pct_change.sizes['year']:
-        ma_ln = xr.full_like(ln_pct_change, fill_value=np.nan)
-    else:
-        ma_ln = ln_pct_change.rolling(year=ma_years, min_periods=ma_years).mean()
+    ma_ln = take_moving_average(ln_pct_change, ma_years)
 
     cum_ln = ln_pct_change.cumsum(dim='year', skipna=True)
 
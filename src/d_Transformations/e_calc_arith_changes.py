@@ -1,8 +1,9 @@
-import numpy as np
 import xarray as xr
+from typing import Sequence
+from d_Transformations.a_take_moving_average import take_moving_average
 
 
-def calc_arith_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
+def calc_arith_changes(ds: xr.Dataset, var: str, ma_years: int | Sequence[int]) -> xr.Dataset:
     """
     Computes period-over-period arithmetic changes for a single variable.
 
@@ -15,7 +16,8 @@ def calc_arith_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
     Args:
         ds:       Dataset with a 'year' dimension containing var.
         var:      Name of the data variable to process.
-        ma_years: Window size for the moving average of arith_change.
+        ma_years: Window size for the moving average of arith_change, or a sequence of
+                  sizes to stack ma_arith_change along a 'window' dimension.
 
     Returns:
         Dataset with the four variables above.
@@ -23,10 +25,7 @@ def calc_arith_changes(ds: xr.Dataset, var: str, ma_years: int) -> xr.Dataset:
     da = ds[var]
     arith_change = da - da.shift(year=1)
 
-    if ma_years > arith_change.sizes['year']:
-        ma_arith = xr.full_like(arith_change, fill_value=np.nan)
-    else:
-        ma_arith = arith_change.rolling(year=ma_years, min_periods=ma_years).mean()
+    ma_arith = take_moving_average(arith_change, ma_years)
 
     cum_arith = arith_change.cumsum(dim='year', skipna=True)
 
@@ -0,0 +1,96 @@
+import numpy as np
+import xarray as xr
+from typing import Sequence
+from a_Config.enumerations.interface_fields_enum import InterfaceFields
+from d_Transformations.a_take_moving_average import moving_means
+
+CHANGE_FIELDS = (InterfaceFields.CHANGE, InterfaceFields.MA_OF_CHANGE, InterfaceFields.CUM_CHANGE)
+
+
+def calc_changes(
+    ds: xr.Dataset,
+    var: str,
+    geometric_measures: Sequence[str],
+    arithmetic_measures: Sequence[str],
+    ma_years: int | Sequence[int],
+    fields: Sequence[InterfaceFields] = CHANGE_FIELDS,
+) -> xr.Dataset:
+    """
+    Fused period-over-period change kernel for a mix of line items and ratios.
+
+    Geometric measures get % changes via log-differencing (as in calc_pct_changes),
+    arithmetic measures absolute differences (as in calc_arith_changes). Both are
+    gathered straight from ds into one preallocated array, geometric first, and the
+    difference, its moving average and its cumulative sum are computed once over the
+    whole measure axis in place; only the geometric rows are then mapped back with
+    exp(x) - 1. No intermediate variables are materialized.
+
+    Returns a Dataset with:
+        CHANGE       = exp(ln(t) - ln(t-1)) - 1, or value(t) - value(t-1)
+        MA_OF_CHANGE = the same transform of the rolling mean of the difference over ma_years
+        CUM_CHANGE   = the same transform of the cumulative sum of the difference (NaN as 0)
+
+    Args:
+        ds:           Dataset with 'measure' and 'year' dimensions containing var.
+        var:          Name of the data variable to process.
+        geometric_measures:  Measures of ds to treat as geometric (% change).
+        arithmetic_measures: Measures of ds to treat as arithmetic (absolute change).
+        ma_years:     Window size for the moving average, or a sequence of sizes to
+                      stack MA_OF_CHANGE along a 'window' dimension.
+        fields:       InterfaceFields to emit; others are not computed.
+
+    Returns:
+        Dataset with the requested fields and the coordinates of ds, over the
+        geometric then arithmetic measures.
+    """
+    da = ds[var]
+    lead_dims = [d for d in da.dims if d != 'year']
+    measure_axis = lead_dims.index('measure')
+    measures = list(geometric_measures) + list(arithmetic_measures)
+    position = {m: i for i, m in enumerate(da.coords['measure'].values)}
+    values = da.transpose(*lead_dims, 'year').values
+    geometric = (slice(None),) * measure_axis + (slice(0, len(geometric_measures)),)
+
+    # Gather the measures, take the log of the geometric rows in place, then
+    # difference along year in place (last year first)
+    shape = list(values.shape)
+    shape[measure_axis] = len(measures)
+    change = np.empty(shape)
+    np.take(values, [position[m] for m in measures], axis=measure_axis, out=change)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.log(change[geometric], out=change[geometric])
+        for t in range(change.shape[-1] - 1, 0, -1):
+            change[..., t] -= change[..., t - 1]
+    change[..., 0] = np.nan
+
+    windowed = not isinstance(ma_years, (int, np.integer))
+    windows = list(ma_years) if windowed else [ma_years]
+    outputs = {}
+    if InterfaceFields.MA_OF_CHANGE in fields:
+        ma = moving_means(change, windows)
+        outputs[InterfaceFields.MA_OF_CHANGE] = ma if windowed else ma[..., 0]
+    if InterfaceFields.CUM_CHANGE in fields:
+        cum = np.zeros_like(change)
+        np.copyto(cum, change, where=~np.isnan(change))
+        np.cumsum(cum, axis=-1, out=cum)
+        outputs[InterfaceFields.CUM_CHANGE] = cum
+    if InterfaceFields.CHANGE in fields:
+        outputs[InterfaceFields.CHANGE] = change
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for out in outputs.values():
+            np.exp(out[geometric], out=out[geometric])
+            out[geometric] -= 1
+
+    dims = lead_dims + ['year']
+    data_vars = {}
+    for field in fields:
+        if field == InterfaceFields.MA_OF_CHANGE and windowed:
+            data_vars[field] = (dims + ['window'], outputs[field])
+        else:
+            data_vars[field] = (dims, outputs[field])
+    coords = {name: coord for name, coord in ds.coords.items() if 'measure' not in coord.dims}
+    coords['measure'] = measures
+    if windowed:
+        coords['window'] = windows
+    return xr.Dataset(data_vars, coords=coords).transpose(*da.dims, ...)
@@ -1,9 +1,10 @@
 import xarray as xr
+from typing import Sequence
 from a_Config.global_constants import ALL_RATIOS
 from d_Transformations.a_take_moving_average import take_moving_average
 
 
-def run_dollar_level_pipeline(underived_ds: xr.Dataset, ma_years: int) -> xr.Dataset:
+def run_dollar_level_pipeline(underived_ds: xr.Dataset, ma_years: int | Sequence[int]) -> xr.Dataset:
     """
     Builds a dollar-level dataset from raw underived financials.
 
@@ -13,7 +14,8 @@ def run_dollar_level_pipeline(underived_ds: xr.Dataset, ma_years: int) -> xr.Dat
 
     Args:
         underived_ds: Dataset from to_dataset(), with dims (organization, state, measure, year).
-        ma_years: Rolling window size for the moving average.
+        ma_years: Rolling window size for the moving average, or a sequence of sizes
+            to compute every window at once along a 'window' dimension of 'ma'.
 
     Returns:
         Dataset with 'value' and 'ma' variables over only the non-ratio measures.
@@ -1,10 +1,11 @@
 import xarray as xr
+from typing import Optional, Sequence
 from a_Config.enumerations.interface_fields_enum import InterfaceFields
 from d_Transformations.b_derived_ratios import derive_ratios
 from e_Data_Pipelines.a_dollar_level_pipeline import run_dollar_level_pipeline
 
 
-def run_level_pipeline(ds: xr.Dataset, ma_years: int) -> xr.Dataset:
+def run_level_pipeline(ds: xr.Dataset, ma_years: int | Sequence[int], ratios: Optional[Sequence[str]] = None) -> xr.Dataset:
     """
     Produce a unified levels dataset with endpoint and ma fields for all
     measures (dollar line items + derived ratios).
@@ -18,7 +19,10 @@ def run_level_pipeline(ds: xr.Dataset, ma_years: int) -> xr.Dataset:
     Args:
         ds:       Dataset with a 'value' variable and dims
                   (organization, state, measure, year).
-        ma_years: Rolling window size for the moving average.
+        ma_years: Rolling window size for the moving average, or a sequence of
+                  sizes; the MA variable then gains a 'window' dimension.
+        ratios:   Derived ratios to append. Defaults to every ratio in
+                  DERIVE_RATIOS; a subset only reads its own sub-measures.
 
     Returns:
         Dataset with InterfaceFields.ENDPOINT and InterfaceFields.MA variables
@@ -37,15 +41,8 @@ def run_level_pipeline(ds: xr.Dataset, ma_years: int) -> xr.Dataset:
 
     # Steps 2-3: derived ratios pulling from dollar_out so only line-item
     # measures are passed (no pre-existing ratio measures in the input).
-    endpoint_ratios = derive_ratios(dollar_out[InterfaceFields.ENDPOINT])
-    ma_ratios = derive_ratios(dollar_out[InterfaceFields.MA])
-    ratio_out = xr.Dataset(
-        {
-            InterfaceFields.ENDPOINT: endpoint_ratios,
-            InterfaceFields.MA: ma_ratios,
-        },
-        coords={'year_failed': ds['year_failed']},
-    )
+    # Endpoint and MA ratios come from the same compiled coefficient matrices.
+    ratio_out = derive_ratios(dollar_out, ratios)
 
     # Step 4: combine
     return xr.concat([dollar_out, ratio_out], dim='measure')
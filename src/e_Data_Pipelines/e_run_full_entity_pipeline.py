@@ -1,24 +1,49 @@
 """
 Runs the full analysis pipeline (ingest → level → change → combined) for a
-filtered set of entities. Caching is left to the calling app.
+filtered set of entities. Results are memoized in the framework-neutral pipeline
+cache; apps may layer their own caching on top.
+
+Passing every lookback window at once (MA_WINDOWS) computes the moving averages
+along a 'window' dimension, so switching windows is a select_ma_window slice
+rather than a pipeline rerun.
 """
 import xarray as xr
+from typing import Optional, Sequence
 from a_Config.enumerations.state_enum import State
-from c_Fin_Statement_Processing.e_main_data_pipeline import load_pre_transformed_dataset
+from c_Fin_Statement_Processing.e_main_data_pipeline import load_pre_transformed_dataset, states_data_fingerprint
+from c_Fin_Statement_Processing.g_pipeline_cache import cached_stage
 from e_Data_Pipelines.b_run_level_pipeline import run_level_pipeline
 from e_Data_Pipelines.c_change_pipeline import run_change_pipeline
 from e_Data_Pipelines.d_run_combined_pipeline import run_combined_pipeline
 
+# Lookback windows offered by the apps' "Lookback Years" input.
+MA_WINDOWS = tuple(range(1, 11))
+
+# Memory budget the apps give the pipeline cache. Their st.cache_data entries already
+# hold the per-window slices they display, so it only needs room for the full
+# multi-window results those slices are cut from (about 260 MB for every state).
+APP_PIPELINE_CACHE_BYTES = 512 * 1024 ** 2
+
+
+def select_ma_window(ds: xr.Dataset, num_years_ma: int) -> xr.Dataset:
+    """Slice one lookback window out of a dataset computed for several windows."""
+    return ds.sel(window=num_years_ma, drop=True) if 'window' in ds.dims else ds
+
 
+@cached_stage(data_fingerprint=states_data_fingerprint, ignore=('max_workers',))
 def run_full_entity_pipeline(
     states: list[State],
-    num_years_ma: int,
+    num_years_ma: int | Sequence[int],
     entities=None,
     year_start=None,
     year_end=None,
+    max_workers: int | None = None,
+    ratios: Optional[Sequence[str]] = None,
 ) -> tuple[xr.Dataset, xr.Dataset, xr.Dataset]:
-    underived_ds = load_pre_transformed_dataset(states, entities=entities, year_start=year_start, year_end=year_end)
-    level_ds = run_level_pipeline(underived_ds, num_years_ma)
+    underived_ds = load_pre_transformed_dataset(
+        states, entities=entities, year_start=year_start, year_end=year_end, max_workers=max_workers
+    )
+    level_ds = run_level_pipeline(underived_ds, num_years_ma, ratios)
     change_ds = run_change_pipeline(level_ds, num_years_ma)
     combined_ds = run_combined_pipeline(level_ds, change_ds)
     return level_ds, change_ds, combined_ds
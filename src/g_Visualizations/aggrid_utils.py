@@ -1,6 +1,7 @@
 import pandas as pd
 from st_aggrid import AgGrid, GridOptionsBuilder, JsCode, GridUpdateMode
 from a_Config.global_constants import FINANCIAL_STATEMENT_MODEL, get_measure_tickformat
+from a_Config.fin_statement_model_utils import get_fin_statement_ancestors, get_fin_statement_descendants_and_self
 
 
 def _tickformat_to_js(fmt: str) -> str:
@@ -21,11 +22,10 @@ def create_hierarchical_aggrid(
     subtree_measures = set()
     ancestor_prefixes = []
     for root in roots:
-        root_path = model.loc[root, 'Path']
-        root_mask = (model['Path'] == root_path) | model['Path'].str.startswith(root_path + ';')
-        subtree_measures.update(model[root_mask].index)
-        if ';' in root_path:
-            ancestor_prefixes.append(root_path.rsplit(';', 1)[0] + ';')
+        subtree_measures.update(get_fin_statement_descendants_and_self(root))
+        ancestors = get_fin_statement_ancestors(root)
+        if ancestors:
+            ancestor_prefixes.append(';'.join(ancestors) + ';')
 
     df = hospital_df.copy()
     df = df[df.index.isin(subtree_measures)].reset_index()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 from a_Config.enumerations.interface_fields_enum import InterfaceFields
@@ -6,7 +7,8 @@ from a_Config.enumerations.measure_source_enum import MeasureSource
 from a_Config.global_constants import DERIVE_RATIOS, HOSPITAL_METADATA, SYSTEMS_TO_HOSPITALS_MAP, get_measure_tickformat
 from a_Config.enumerations import *
 from a_Config.fin_statement_model_utils import BALANCE_SHEET_MEASURES, INCOME_STATEMENT_MEASURES, OTHER_MEASURES, get_fin_statement_descendants_and_self
-from e_Data_Pipelines.e_run_full_entity_pipeline import run_full_entity_pipeline
+from c_Fin_Statement_Processing.g_pipeline_cache import PIPELINE_CACHE
+from e_Data_Pipelines.e_run_full_entity_pipeline import APP_PIPELINE_CACHE_BYTES, MA_WINDOWS, run_full_entity_pipeline, select_ma_window
 from d_Transformations.c_normalize_measures import normalize_measures
 from f_Aggregations.aggregations import calc_population_aggregates
 from g_Visualizations.hospital_time_series import plot_hospital_time_series
@@ -18,20 +20,27 @@ st.set_page_config(
     layout="wide"
 )
 
+PIPELINE_CACHE.resize(APP_PIPELINE_CACHE_BYTES)
+
 
 #######################################################################################################
 # Cached pipeline helpers
 #######################################################################################################
 
 @st.cache_data
-@st.cache_data
-def _build_entity_datasets(states: tuple, num_years_ma: int, entities: frozenset, year_begin=None, year_end=None):
-    return run_full_entity_pipeline(list(states), num_years_ma, entities=entities, year_start=year_begin, year_end=year_end)
+def _build_entity_datasets(states: tuple, num_years_ma: int, entities: frozenset, year_begin=None, year_end=None, ratios: tuple | None = None):
+    # Every lookback window is computed (and memoized) at once; the slider only picks a slice
+    datasets = run_full_entity_pipeline(list(states), MA_WINDOWS, entities=entities, year_start=year_begin, year_end=year_end, ratios=ratios)
+    return tuple(select_ma_window(ds, num_years_ma) for ds in datasets)
 
 
-@st.cache_data
-def _normalize_dollar_ds(_dollar_level_ds, normalization_measure: str):
-    return normalize_measures(_dollar_level_ds, normalization_measure, vars=[InterfaceFields.ENDPOINT, InterfaceFields.MA])
+@st.cache_resource
+def _normalize_dollar_ds(states: tuple, entities: frozenset):
+    # Every normalizer and lookback window at once, in float32; held once and treated as
+    # read-only, so switching either is a .sel with no division or copy. Only line items
+    # are normalized, so no ratios are derived
+    level_ds, _, _ = run_full_entity_pipeline(list(states), MA_WINDOWS, entities=entities, ratios=())
+    return normalize_measures(level_ds, NORMALIZATION_OPTIONS, vars=[InterfaceFields.ENDPOINT, InterfaceFields.MA], dtype=np.float32)
 
 
 
@@ -88,14 +97,16 @@ endpoint_or_ma = MovingAvgOrEndpoint(
     st.sidebar.radio('Value Type', [e.value for e in MovingAvgOrEndpoint])
 )
 
-num_years_ma = st.sidebar.number_input('Lookback Years', 1, 10, 5)
+num_years_ma = st.sidebar.number_input('Lookback Years', min(MA_WINDOWS), max(MA_WINDOWS), 5)
 
 
 #######################################################################################################
 # Data
 #######################################################################################################
 
-level_ds, _, _ = _build_entity_datasets((selected_state,), num_years_ma, frozenset(entities_in_state))
+# Line-item views never read a ratio, so ratios are only derived for the ratio view
+ratios_to_derive = None if measure_source == MeasureSource.RATIOS else ()
+level_ds, _, _ = _build_entity_datasets((selected_state,), num_years_ma, frozenset(entities_in_state), ratios=ratios_to_derive)
 
 active_var = InterfaceFields.MA if endpoint_or_ma == MovingAvgOrEndpoint.MOVING_AVG else InterfaceFields.ENDPOINT
 
@@ -105,7 +116,9 @@ active_ds = level_ds.sel(organization=type_orgs)
 aggregate_ds = calc_population_aggregates(active_ds, var=active_var)
 
 if measure_source != MeasureSource.RATIOS:
-    full_normalized_ds = _normalize_dollar_ds(level_ds, normalization)
+    full_normalized_ds = select_ma_window(
+        _normalize_dollar_ds((selected_state,), frozenset(entities_in_state)), num_years_ma
+    ).sel(normalizer=normalization, drop=True)
     normalized_ds = full_normalized_ds.sel(organization=type_orgs)
     agg_norm_ds = calc_population_aggregates(normalized_ds, var=active_var)
 